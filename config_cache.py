@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Shared loader for group_titles_with_flags.json
+Parses the config once per file version and hands back the include/exclude group sets
+"""
+
+import os
+from functools import lru_cache
+
+from json_io import load_json
+
+@lru_cache(maxsize=4)
+def _load_buckets(path, mtime_ns):
+    """Parse the config and split group titles by their exclude flag"""
+    data = load_json(path)
+
+    include = frozenset(entry.get('group_title') for entry in data if entry.get('exclude') == 'false')
+    exclude = frozenset(entry.get('group_title') for entry in data if entry.get('exclude') != 'false')
+    return include, exclude
+
+def get_buckets(path='group_titles_with_flags.json'):
+    """Return (include, exclude) frozensets, re-parsing only when the file changes"""
+    return _load_buckets(path, os.stat(path).st_mtime_ns)
@@ -9,6 +9,20 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from googleapiclient.errors import HttpError
 
+from gdrive_common import first_existing
+
+# Files below this size go up in one multipart request; resumable uploads cost an extra round-trip
+RESUMABLE_MIN_BYTES = 5 << 20
+
+# Chunk size for resumable uploads (8 MiB, a multiple of the required 256 KiB)
+UPLOAD_CHUNK_SIZE = 8 << 20
+
+def make_media(file_path):
+    """Build the upload body, only using a resumable session for large files"""
+    if os.path.getsize(file_path) < RESUMABLE_MIN_BYTES:
+        return MediaFileUpload(file_path, resumable=False)
+    return MediaFileUpload(file_path, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+
 class ServiceAccountGDriveUploader:
     """Google Drive uploader using service account with shared drive support"""
     
@@ -16,17 +30,13 @@ class ServiceAccountGDriveUploader:
         """Initialize with service account and optional shared drive config"""
         if service_account_file is None:
             # Try to find service account file
-            candidates = [
+            service_account_file = first_existing([
                 'data/config/gdrive_service_account.json',
                 '/app/data/config/gdrive_service_account.json'  # Container path
-            ]
-            
-            for candidate in candidates:
-                if os.path.exists(candidate):
-                    service_account_file = candidate
-                    break
-        
-        if not service_account_file or not os.path.exists(service_account_file):
+            ])
+            if not service_account_file:
+                raise FileNotFoundError("Service account file not found")
+        elif not os.path.exists(service_account_file):
             raise FileNotFoundError("Service account file not found")
         
         self.service_account_file = service_account_file
@@ -123,7 +133,7 @@ class ServiceAccountGDriveUploader:
                 'parents': [folder_id or self.shared_drive_id]
             }
             
-            media = MediaFileUpload(file_path, resumable=True)
+            media = make_media(file_path)
             
             file = self.service.files().create(
                 body=file_metadata,
@@ -7,9 +7,7 @@ try:
     with open('group_titles_with_flags.json', 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    for entry in data:
-        if entry.get('exclude') == 'false':
-            allowed_groups.add(entry.get('group_title'))
+    allowed_groups = {entry.get('group_title') for entry in data if entry.get('exclude') == 'false'}
     
     print(f"Loaded {len(allowed_groups)} allowed groups")
 except Exception as e:
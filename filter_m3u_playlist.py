@@ -14,10 +14,7 @@ def load_exclude_false_groups():
         with open('group_titles_with_flags.json', 'r', encoding='utf-8') as f:
             data = json.load(f)
         
-        exclude_false_groups = set()
-        for entry in data:
-            if entry.get('exclude') == 'false':
-                exclude_false_groups.add(entry.get('group_title'))
+        exclude_false_groups = {entry.get('group_title') for entry in data if entry.get('exclude') == 'false'}
         
         return exclude_false_groups
     except Exception as e:
@@ -61,21 +58,26 @@ def get_unknown_groups(input_file, known_groups):
         print(f"Error analyzing unknown groups: {e}")
         return {}
 
-def should_auto_exclude_unknown_group(unknown_group, exclude_groups):
+# Common exclusion patterns for unknown groups
+AUTO_EXCLUDE_PATTERNS = ('tv guide', 'network', 'affiliates', 'adult', 'xxx', ' sd', 'hevc')
+
+def find_excluded_patterns(exclude_groups):
+    """Return the exclusion patterns that occur in at least one excluded group, lowering each group once."""
+    excluded_lower = [g.lower() for g in exclude_groups]
+    return tuple(pattern for pattern in AUTO_EXCLUDE_PATTERNS
+                 if any(pattern in g for g in excluded_lower))
+
+def should_auto_exclude_unknown_group(unknown_group, exclude_groups, excluded_patterns=None):
     """Check if unknown group should be excluded based on patterns."""
-    group_lower = unknown_group.lower()
+    if excluded_patterns is None:
+        excluded_patterns = find_excluded_patterns(exclude_groups)
     
-    # Common exclusion patterns
-    exclude_patterns = [
-        'tv guide', 'network', 'affiliates', 'adult', 'xxx', ' sd', 'hevc'
-    ]
+    group_lower = unknown_group.lower()
     
-    for pattern in exclude_patterns:
+    # Only patterns with a similar excluded group can exclude; keep the list order
+    for pattern in excluded_patterns:
         if pattern in group_lower:
-            # Check if similar pattern exists in exclude_groups
-            similar_excluded = [g for g in exclude_groups if pattern in g.lower()]
-            if similar_excluded:
-                return True, f"Matches excluded pattern: {pattern}"
+            return True, f"Matches excluded pattern: {pattern}"
     
     return False, "No matching exclusion patterns"
 
@@ -100,9 +102,10 @@ def filter_m3u_playlist(input_file, output_file, allowed_groups, auto_include_un
             print(f"\n🔍 Found {len(unknown_groups)} unknown groups:")
             auto_included = []
             auto_excluded = []
+            excluded_patterns = find_excluded_patterns(exclude_groups)
             
             for group, count in unknown_groups.items():
-                should_exclude, reason = should_auto_exclude_unknown_group(group, exclude_groups)
+                should_exclude, reason = should_auto_exclude_unknown_group(group, exclude_groups, excluded_patterns)
                 if should_exclude:
                     auto_excluded.append((group, count, reason))
                     print(f"  ❌ EXCLUDE: '{group}' ({count} channels) - {reason}")
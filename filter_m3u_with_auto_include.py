@@ -22,7 +22,7 @@ def find_config_file(filename):
         return filename  # Return filename for error reporting
 
 def load_group_configuration():
-    """Load group titles configuration with include/exclude lists and overrides."""
+    """Load group titles configuration with include/exclude lists, overrides and group order."""
     try:
         config_file = find_config_file('group_titles_with_flags.json')
         with open(config_file, 'r', encoding='utf-8') as f:
@@ -32,6 +32,7 @@ def load_group_configuration():
         exclude_groups = set()  # exclude=true
         all_groups = {}
         group_overrides = {}  # original_title -> override_title
+        group_order_map = {}  # effective_title -> order
         
         for entry in data:
             group_title = entry.get('group_title')
@@ -57,6 +58,9 @@ def load_group_configuration():
                 include_groups.add(effective_title)
             else:
                 exclude_groups.add(effective_title)
+            
+            # Ordering uses the override title whenever the key is present
+            group_order_map[entry.get('override_title', group_title)] = entry.get('order', 9999)
         
         # Show override summary if any were found
         if group_overrides:
@@ -66,10 +70,10 @@ def load_group_configuration():
             if len(group_overrides) > 5:
                 print(f"   ... and {len(group_overrides) - 5} more")
         
-        return include_groups, exclude_groups, all_groups, group_overrides
+        return include_groups, exclude_groups, all_groups, group_overrides, group_order_map
     except Exception as e:
         print(f"Error loading group titles: {e}")
-        return set(), set(), {}, {}
+        return set(), set(), {}, {}, {}
 
 def analyze_unknown_groups(playlist_file, all_known_groups, group_overrides=None):
     """Find unknown groups in the playlist, considering group overrides."""
@@ -96,57 +100,69 @@ def analyze_unknown_groups(playlist_file, all_known_groups, group_overrides=None
         print(f"Error analyzing unknown groups: {e}")
         return {}
 
-def should_exclude_unknown_group(unknown_group, excluded_groups):
+# Content keywords compared against excluded groups when an unknown group has no country prefix
+BROAD_EXCLUSION_KEYWORDS = ('guide', 'adult', 'xxx', 'network', 'affiliates')
+
+# Pattern matching for content types that are commonly excluded
+EXCLUSION_PATTERNS = {
+    'adult': ('adult', 'xxx', 'for adults'),
+    'local_networks': ('network', 'affiliates', 'local'),
+    'guides': ('guide', 'tv guide'),
+    'low_quality': (' sd', 'sd '),
+    'specific_sports': ('nfl', 'nba', 'nhl', 'mlb'),
+    'hevc': ('hevc', 'h265')
+}
+
+def lowercase_groups(groups):
+    """Pair each group with its lowercase form so classification lowers each group only once."""
+    return [(group, group.lower()) for group in groups]
+
+def should_exclude_unknown_group(unknown_group, excluded_groups, excluded_lower=None):
     """
     Determine if an unknown group should be excluded based on 
     pattern matching with existing excluded groups.
+    Pass excluded_lower from lowercase_groups(excluded_groups) when classifying many groups.
     """
+    if excluded_lower is None:
+        excluded_lower = lowercase_groups(excluded_groups)
+    
     # Extract country/region prefix (e.g., "AU|", "CA|", "UK|", "US|")
     unknown_prefix_match = re.match(r'^([A-Z]{2}\|)', unknown_group)
     if not unknown_prefix_match:
         # If no country prefix, check against excluded patterns more broadly
         unknown_lower = unknown_group.lower()
-        for excluded_group in excluded_groups:
-            excluded_lower = excluded_group.lower()
-            # Check for similar content types
-            if any(keyword in unknown_lower and keyword in excluded_lower 
-                   for keyword in ['guide', 'adult', 'xxx', 'network', 'affiliates']):
-                return True, f"Matches excluded content pattern: '{excluded_group}'"
+        keywords = [keyword for keyword in BROAD_EXCLUSION_KEYWORDS if keyword in unknown_lower]
+        if keywords:
+            for excluded_group, group_lower in excluded_lower:
+                # Check for similar content types
+                if any(keyword in group_lower for keyword in keywords):
+                    return True, f"Matches excluded content pattern: '{excluded_group}'"
         return False, "No matching excluded patterns found"
     
     unknown_prefix = unknown_prefix_match.group(1)
     unknown_lower = unknown_group.lower()
     
     # Check if we have excluded groups with the same prefix
-    matching_excluded = [g for g in excluded_groups if g.startswith(unknown_prefix)]
+    matching_excluded = [(g, gl) for g, gl in excluded_lower if g.startswith(unknown_prefix)]
     
     if not matching_excluded:
         return False, f"No excluded groups found with prefix '{unknown_prefix}'"
     
-    # Pattern matching for content types that are commonly excluded
-    exclusion_patterns = {
-        'adult': ['adult', 'xxx', 'for adults'],
-        'local_networks': ['network', 'affiliates', 'local'],
-        'guides': ['guide', 'tv guide'],
-        'low_quality': [' sd', 'sd '],
-        'specific_sports': ['nfl', 'nba', 'nhl', 'mlb'],
-        'hevc': ['hevc', 'h265']
-    }
-    
-    for pattern_type, keywords in exclusion_patterns.items():
+    for pattern_type, keywords in EXCLUSION_PATTERNS.items():
         if any(keyword in unknown_lower for keyword in keywords):
             # Check if we have similar excluded content with same prefix
-            similar_excluded = [g for g in matching_excluded 
-                              if any(keyword in g.lower() for keyword in keywords)]
+            similar_excluded = [g for g, gl in matching_excluded 
+                              if any(keyword in gl for keyword in keywords)]
             if similar_excluded:
                 return True, f"Matches excluded {pattern_type} pattern: {similar_excluded[:2]}"
     
     return False, f"No matching exclusion patterns found for prefix '{unknown_prefix}'"
 
-def filter_m3u_playlist_with_unknown_inclusion(input_file, output_file, include_groups, exclude_groups, group_overrides=None, auto_include_unknown=True):
+def filter_m3u_playlist_with_unknown_inclusion(input_file, output_file, include_groups, exclude_groups, group_overrides=None, auto_include_unknown=True, group_order_map=None):
     """Enhanced filter that includes unknown groups by default, but excludes pattern matches.
     Also sorts output by group order from configuration.
-    Now includes group title override functionality."""
+    Now includes group title override functionality.
+    Pass group_order_map from load_group_configuration() to avoid re-reading the config."""
     
     if group_overrides is None:
         group_overrides = {}
@@ -164,18 +180,19 @@ def filter_m3u_playlist_with_unknown_inclusion(input_file, output_file, include_
         print(f"❌ Error reading input file: {e}")
         return False
 
-    # Load group configuration for ordering
-    config_file = find_config_file('group_titles_with_flags.json')
-    group_order_map = {}
-    try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-            for entry in config_data:
-                # Use override title if available, otherwise use original title
-                effective_title = entry.get('override_title', entry['group_title'])
-                group_order_map[effective_title] = entry.get('order', 9999)
-    except Exception as e:
-        print(f"⚠️  Warning: Could not load group order configuration: {e}")
+    # Load group configuration for ordering unless the caller already has it
+    if group_order_map is None:
+        config_file = find_config_file('group_titles_with_flags.json')
+        group_order_map = {}
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config_data = json.load(f)
+                for entry in config_data:
+                    # Use override title if available, otherwise use original title
+                    effective_title = entry.get('override_title', entry['group_title'])
+                    group_order_map[effective_title] = entry.get('order', 9999)
+        except Exception as e:
+            print(f"⚠️  Warning: Could not load group order configuration: {e}")
     
     # Analyze unknown groups
     all_known_groups = include_groups | exclude_groups
@@ -186,9 +203,10 @@ def filter_m3u_playlist_with_unknown_inclusion(input_file, output_file, include_
     
     if auto_include_unknown and unknown_groups:
         print(f"\n🔍 Analyzing {len(unknown_groups)} unknown groups...")
+        excluded_lower = lowercase_groups(exclude_groups)
         
         for group, count in unknown_groups.items():
-            should_exclude, reason = should_exclude_unknown_group(group, exclude_groups)
+            should_exclude, reason = should_exclude_unknown_group(group, exclude_groups, excluded_lower)
             if should_exclude:
                 auto_excluded_groups.add(group)
                 print(f"  ❌ AUTO-EXCLUDE: '{group}' ({count} channels) - {reason}")
@@ -389,7 +407,7 @@ def main():
     
     # Load configuration
     print("📋 Loading group configuration...")
-    include_groups, exclude_groups, all_groups, group_overrides = load_group_configuration()
+    include_groups, exclude_groups, all_groups, group_overrides, group_order_map = load_group_configuration()
     
     if not include_groups and not exclude_groups:
         print("❌ No groups found in configuration!")
@@ -408,7 +426,8 @@ def main():
     
     # Run enhanced filtering
     success = filter_m3u_playlist_with_unknown_inclusion(
-        input_file, output_file, include_groups, exclude_groups, group_overrides, auto_include_unknown=True
+        input_file, output_file, include_groups, exclude_groups, group_overrides, auto_include_unknown=True,
+        group_order_map=group_order_map
     )
     
     if success:
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the Google Drive setup scripts
+Cached JSON loading and one Drive client per service account key
+"""
+
+import os
+from functools import lru_cache
+
+from json_io import load_json
+
+# Socket timeout for the shared HTTP connection pool
+HTTP_TIMEOUT_SECONDS = 30
+
+# Parsed JSON files keyed by path -> ((mtime_ns, size), data)
+_JSON_CACHE = {}
+
+def cached_json(path):
+    """Load a JSON file, reusing the parsed result while the file is unchanged"""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    entry = _JSON_CACHE.get(path)
+    if entry and entry[0] == key:
+        return entry[1]
+    data = load_json(path)
+    _JSON_CACHE[path] = (key, data)
+    return data
+
+def first_existing(candidates):
+    """Return the first candidate path that exists"""
+    return next((p for p in candidates if os.path.exists(p)), None)
+
+@lru_cache(maxsize=4)
+def load_sa_credentials(path, scopes):
+    """Load service account credentials once per key file and scope set"""
+    from google.oauth2 import service_account
+    return service_account.Credentials.from_service_account_file(path, scopes=list(scopes))
+
+@lru_cache(maxsize=1)
+def _shared_http():
+    """One httplib2 transport so every Drive client keeps reusing the same TCP/TLS sessions"""
+    import httplib2
+    return httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+
+@lru_cache(maxsize=4)
+def build_drive_service(path, scopes):
+    """Build the Drive v3 client once per key file and scope set"""
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build
+    http = AuthorizedHttp(load_sa_credentials(path, scopes), http=_shared_http())
+    return build('drive', 'v3', http=http)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Shared JSON helpers for the config scripts
+Uses orjson when it is installed and falls back to the stdlib json module with the same output
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads_json(raw):
+    """Parse JSON from bytes or str"""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def load_json(path):
+    """Read and parse a JSON file"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return loads_json(raw)
+
+def dump_json(data):
+    """Serialize data as indented UTF-8 JSON bytes"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def write_atomic(path, payload):
+    """Write bytes to a temp file and swap it in, so a crash never leaves a truncated file"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def write_json(path, data):
+    """Write data as indented JSON, replacing path atomically"""
+    write_atomic(path, dump_json(data))
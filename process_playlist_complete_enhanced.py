@@ -25,8 +25,8 @@ import sys
 import os
 import json
 import time
-from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 
 # Fix Unicode encoding issues on Windows
 if sys.platform.startswith('win'):
@@ -108,9 +108,16 @@ def check_file_exists(filepath, description="File", silent=False):
 def get_file_info(filepath):
     """Get file size and line count"""
     try:
-        size = os.path.getsize(filepath)
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = sum(1 for _ in f)
+        size = os.stat(filepath).st_size
+        # Count newlines in large binary chunks rather than decoding every line
+        lines = 0
+        last_chunk = b''
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                lines += chunk.count(b'\n')
+                last_chunk = chunk
+        if last_chunk and not last_chunk.endswith(b'\n'):
+            lines += 1  # Final line without a trailing newline
         return size, lines
     except:
         return 0, 0
@@ -415,9 +422,16 @@ def check_file_exists(filepath, description="File", silent=False):
 def get_file_info(filepath):
     """Get file size and line count"""
     try:
-        size = os.path.getsize(filepath)
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = sum(1 for _ in f)
+        size = os.stat(filepath).st_size
+        # Count newlines in large binary chunks rather than decoding every line
+        lines = 0
+        last_chunk = b''
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                lines += chunk.count(b'\n')
+                last_chunk = chunk
+        if last_chunk and not last_chunk.endswith(b'\n'):
+            lines += 1  # Final line without a trailing newline
         return size, lines
     except:
         return 0, 0
@@ -754,12 +768,27 @@ def step_gdrive_backup(skip=False):
     
     return True  # Always return True for optional step
 
+@lru_cache(maxsize=8)
+def parse_token_expiry(expiry):
+    """Parse a token expiry timestamp once per distinct value"""
+    # Python 3.11+ accepts the trailing 'Z' natively
+    if sys.version_info >= (3, 11):
+        return datetime.fromisoformat(expiry)
+    return datetime.fromisoformat(expiry.replace('Z', '+00:00'))
+
+@lru_cache(maxsize=1)
+def load_google_auth_classes():
+    """Import the Google auth classes only when a token refresh is needed"""
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    return Request, Credentials
+
 def check_and_refresh_token():
     """Check token expiry and refresh if needed"""
     # Use the same logic as the main function to find token
     gdrive_token = find_config_file("gdrive_token.json")
     
-    if not gdrive_token or not os.path.exists(gdrive_token):
+    if not gdrive_token:
         return False
         
     try:
@@ -767,7 +796,7 @@ def check_and_refresh_token():
             token_data = json.load(f)
         
         if 'expiry' in token_data and token_data['expiry']:
-            expiry_time = datetime.fromisoformat(token_data['expiry'].replace('Z', '+00:00'))
+            expiry_time = parse_token_expiry(token_data['expiry'])
             now = datetime.now(expiry_time.tzinfo)
             time_left = expiry_time - now
             
@@ -779,8 +808,7 @@ def check_and_refresh_token():
                     print("🔄 Attempting automatic token refresh...")
                     try:
                         # Import here to avoid dependency issues
-                        from google.auth.transport.requests import Request
-                        from google.oauth2.credentials import Credentials
+                        Request, Credentials = load_google_auth_classes()
                         
                         creds = Credentials.from_authorized_user_file(gdrive_token)
                         if creds.expired and creds.refresh_token:
@@ -805,24 +833,30 @@ def check_and_refresh_token():
                 print(f"✅ Token valid for: {time_left}")
                 return True
                         
+    except FileNotFoundError:
+        return False
     except Exception as e:
         print(f"❌ Error checking token {gdrive_token}: {e}")
     
     return False
 
+_IS_CONTAINER = None
+
+def is_container_environment():
+    """Detect a container environment once per process, cheapest checks first"""
+    global _IS_CONTAINER
+    if _IS_CONTAINER is None:
+        _IS_CONTAINER = (
+            os.environ.get('CONTAINER') == 'true'  # Generic container indicator
+            or 'KUBERNETES_SERVICE_HOST' in os.environ  # Kubernetes
+            or os.path.exists('/.dockerenv')  # Docker container
+            or os.path.exists('/proc/1/cgroup')  # Linux container check
+        )
+    return _IS_CONTAINER
+
 def setup_container_gdrive_auth():
     """Setup Google Drive authentication for container environments (no browser)"""
-    container_indicators = [
-        os.path.exists('/.dockerenv'),  # Docker container
-        os.getenv('KUBERNETES_SERVICE_HOST'),  # Kubernetes
-        os.getenv('CONTAINER') == 'true',  # Generic container indicator
-        os.path.exists('/proc/1/cgroup')  # Linux container check
-    ]
-    
-    # Check if we're in a container
-    is_container = any(container_indicators)
-    
-    if is_container:
+    if is_container_environment():
         print("🐳 Container environment detected")
         print("🚫 Browser authentication not available in containers")
         print("🔧 Using container-friendly authentication methods...")
@@ -952,9 +986,11 @@ def main():
         
         # List generated files
         output_files = []
-        for file in Path('.').glob('8k_*.m3u'):
-            size = file.stat().st_size
-            output_files.append(f"   - {file.name} ({size:,} bytes)")
+        with os.scandir('.') as entries:
+            for entry in entries:
+                if entry.name.startswith('8k_') and entry.name.endswith('.m3u'):
+                    size = entry.stat().st_size
+                    output_files.append(f"   - {entry.name} ({size:,} bytes)")
         
         if output_files:
             print("\n".join(output_files))
@@ -990,17 +1026,19 @@ def step_api_converter(skip=False):
     
     if success:
         # Check for generated files in data directory
-        api_files = []
+        api_files = []  # (path, size) using the directory entry's cached stat
         data_dir = "data"
-        if os.path.exists(data_dir):
-            for file in os.listdir(data_dir):
-                if file.startswith("xstream_api_") and file.endswith(".m3u"):
-                    api_files.append(os.path.join(data_dir, file))
+        try:
+            with os.scandir(data_dir) as entries:
+                api_files = [(entry.path, entry.stat().st_size) for entry in entries
+                             if entry.name.startswith("xstream_api_") and entry.name.endswith(".m3u")]
+        except FileNotFoundError:
+            pass
         
         if api_files:
             print(f"✅ Generated {len(api_files)} API playlists:")
-            for file in api_files:
-                size, lines = get_file_info(file)
+            for file, size in api_files:
+                _, lines = get_file_info(file)
                 filename = os.path.basename(file)
                 print(f"  📁 {filename} ({size:,} bytes, {lines:,} lines)")
         else:
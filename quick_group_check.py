@@ -1,20 +1,24 @@
 import re
-import json
+import mmap
+from collections import Counter
 
-# Extract groups from downloaded playlist
-with open('data/downloaded_file.m3u', 'r', encoding='utf-8') as f:
-    content = f.read()
+from json_io import load_json
 
-groups = re.findall(r'group-title="([^"]+)"', content)
-from collections import Counter
-group_counts = Counter(groups)
+GROUP_TITLE_PATTERN = re.compile(rb'group-title="([^"]+)"')
+
+# Extract groups from downloaded playlist without materialising the match list
+with open('data/downloaded_file.m3u', 'rb') as f:
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        raw_counts = Counter(m.group(1) for m in GROUP_TITLE_PATTERN.finditer(mm))
+
+# Decode only the unique group names
+group_counts = Counter({group.decode('utf-8'): count for group, count in raw_counts.items()})
 
 print(f"Found {len(group_counts)} unique groups in downloaded playlist")
 print(f"Total entries: {sum(group_counts.values())}")
 
 # Load config groups
-with open('group_titles_with_flags.json', 'r', encoding='utf-8') as f:
-    config = json.load(f)
+config = load_json('group_titles_with_flags.json')
 
 config_groups = set([entry['group_title'] for entry in config])
 
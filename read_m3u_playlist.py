@@ -7,6 +7,20 @@ import json
 # Static list of group-titles to ignore
 IGNORED_GROUP_TITLES = ["HINDI TAMIL", "BN - BENGALI", "BFBS ᴿᴬᵂ", "GENERAL ʰᵉᵛᶜ","News ʰᵉᵛᶜ","SPORT SD", "LEAGUE ONE PPV", "LEAGUE TWO PPV", "CRUNCHYROLL SERIES (MULTI-SUBS)", "IN - TAMIL", "IN - TELUGU"]
 
+# EXTINF attribute extraction (tvg-id, tvg-name, tvg-logo, group-title)
+EXTINF_PATTERN = re.compile(
+    r'tvg-id="([^"]*)".*?tvg-name="([^"]*)".*?tvg-logo="([^"]*)".*?group-title="([^"]*)"'
+)
+
+# Markers stripped from tvg-name in a single pass
+TVG_NAME_CLEANUP = re.compile(r'4K-?|◉')
+
+# Buffer size for playlist file I/O (1 MiB)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Number of entries joined per write call when writing playlists
+WRITE_CHUNK_ENTRIES = 10000
+
 async def fetch_m3u_playlist(url):
     """
     Fetches an .m3u playlist file from a URL asynchronously.
@@ -24,6 +38,26 @@ async def fetch_m3u_playlist(url):
         print(f"Error fetching the .m3u file: {e}")
         return []
 
+def iter_m3u_entries(lines):
+    """
+    Pairs each media file path/URL with the #EXTINF line that precedes it.
+
+    :param lines: List of lines from the .m3u file
+    :return: Iterator of (extinf_line, file_path) tuples; extinf_line is None for bare URLs
+    """
+    extinf_line = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            # Keep the latest #EXTINF, skip other directives (e.g., #EXTM3U)
+            if line.startswith("#EXTINF:"):
+                extinf_line = line
+            continue
+        yield extinf_line, line
+        extinf_line = None
+
 def read_m3u_playlist(lines):
     """
     Reads an .m3u playlist file and extracts the media file paths and metadata.
@@ -42,54 +76,41 @@ def read_m3u_playlist(lines):
         return []
 
     try:
-        current_metadata = {}
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                # Handle metadata lines (e.g., #EXTINF)
-                if line.startswith("#EXTINF:"):
-                    # Extract metadata attributes (e.g., tvg-id, tvg-name, group-title)
-                    metadata_match = re.search(
-                        r'tvg-id="([^"]*)".*?tvg-name="([^"]*)".*?tvg-logo="([^"]*)".*?group-title="([^"]*)"',
-                        line
-                    )
-                    if metadata_match:
-                        tvg_id = metadata_match.group(1).strip()
-                        tvg_name = metadata_match.group(2).replace("◉", "").replace("4K-","").replace("4K", "").strip()
-                        tvg_logo = metadata_match.group(3).strip()
-                        group_title = metadata_match.group(4).replace("UK| ","").strip()
-
-                        # Check if group-title is "24/7 ᴴᴰ/ᴿᴬᵂ" and update based on mapping
-                        if group_title == "24/7 ᴴᴰ/ᴿᴬᵂ":
-                            for category, channels in channel_group_mapping.items():
-                                if isinstance(channels, list) and tvg_name in channels:
-                                    group_title = category
-                                    break
-
-                        current_metadata = {
-                            "tvg-id": tvg_id,
-                            "tvg-name": tvg_name,
-                            "tvg-logo": tvg_logo,
-                            "group-title": group_title
-                        }
+        for extinf_line, file_path in iter_m3u_entries(lines):
+            # Extract metadata attributes (e.g., tvg-id, tvg-name, group-title)
+            metadata_match = EXTINF_PATTERN.search(extinf_line) if extinf_line else None
+            if not metadata_match:
+                playlist.append({"metadata": {}, "file_path": file_path})
                 continue
 
+            tvg_name = TVG_NAME_CLEANUP.sub("", metadata_match.group(2)).strip()
+            group_title = metadata_match.group(4).replace("UK| ","").strip()
+
             # Ignore entries where tvg-name starts with ####
-            if current_metadata.get("tvg-name", "").startswith("####"):
-                current_metadata = {}  # Reset metadata for the next entry
+            if tvg_name.startswith("####"):
                 continue
 
+            # Check if group-title is "24/7 ᴴᴰ/ᴿᴬᵂ" and update based on mapping
+            if group_title == "24/7 ᴴᴰ/ᴿᴬᵂ":
+                for category, channels in channel_group_mapping.items():
+                    if isinstance(channels, list) and tvg_name in channels:
+                        group_title = category
+                        break
+
             # Ignore entries with group-titles in the ignored list
-            if current_metadata.get("group-title") in IGNORED_GROUP_TITLES:
-                current_metadata = {}  # Reset metadata for the next entry
+            if group_title in IGNORED_GROUP_TITLES:
                 continue
 
             # Handle media file path/URL
             playlist.append({
-                "metadata": current_metadata,
-                "file_path": line
+                "metadata": {
+                    "tvg-id": metadata_match.group(1).strip(),
+                    "tvg-name": tvg_name,
+                    "tvg-logo": metadata_match.group(3).strip(),
+                    "group-title": group_title
+                },
+                "file_path": file_path
             })
-            current_metadata = {}  # Reset metadata for the next entry
 
         return playlist
 
@@ -105,21 +126,29 @@ def write_m3u_playlist(output_file_path, playlist_data):
     :param playlist_data: List of dictionaries containing metadata and file paths/URLs
     """
     try:
-        with open(output_file_path, 'w', encoding='utf-8') as file:
-            file.write("#EXTM3U\n")  # Write the header for the .m3u file
-            for entry in playlist_data:
+        # Large buffer so thousands of small entry writes become a few syscalls
+        with open(output_file_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as file:
+            parts = ["#EXTM3U\n"]  # Header for the .m3u file
+            for index, entry in enumerate(playlist_data, start=1):
                 metadata = entry["metadata"]
                 file_path = entry["file_path"]
                 if metadata:
-                    extinf_line = (
+                    parts.append(
                         f'#EXTINF:-1 tvg-id="{metadata.get("tvg-id", "")}" '
                         f'tvg-name="{metadata.get("tvg-name", "")}" '
                         f'tvg-logo="{metadata.get("tvg-logo", "")}" '
                         f'group-title="{metadata.get("group-title", "")}",'
                         f'{metadata.get("tvg-name", "")}\n'
+                        f'{file_path}\n'
                     )
-                    file.write(extinf_line)
-                file.write(f"{file_path}\n")
+                else:
+                    parts.append(f"{file_path}\n")
+
+                # Flush in chunks to keep peak memory bounded on huge playlists
+                if index % WRITE_CHUNK_ENTRIES == 0:
+                    file.write("".join(parts))
+                    parts.clear()
+            file.write("".join(parts))
         print(f"New .m3u file created: {output_file_path}")
     except Exception as e:
         print(f"An error occurred while writing the file: {e}")
@@ -3,49 +3,48 @@
 Script to reorder group_titles_with_flags.json to place all entries with "exclude": "false" at the top.
 """
 
-import json
-import os
+from collections import Counter
+from itertools import islice
+
+from json_io import load_json, write_json
 
 def reorder_json_by_exclude():
     # File paths
     input_file = "group_titles_with_flags.json"
     
-    # Check if input file exists
-    if not os.path.exists(input_file):
-        print(f"Error: {input_file} not found!")
-        return
-    
     # Read the JSON file
     print(f"Reading {input_file}...")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    try:
+        data = load_json(input_file)
+    except FileNotFoundError:
+        print(f"Error: {input_file} not found!")
+        return
     
     print(f"Total entries: {len(data)}")
     
-    # Separate entries by exclude value
-    exclude_false = []
-    exclude_true = []
+    # Count entries by exclude value
+    exclude_counts = Counter(entry.get("exclude") for entry in data)
+    false_count = exclude_counts["false"]
+    true_count = len(data) - false_count
     
-    for entry in data:
-        if entry.get("exclude") == "false":
-            exclude_false.append(entry)
-        else:
-            exclude_true.append(entry)
+    print(f"Entries with exclude='false': {false_count}")
+    print(f"Entries with exclude='true': {true_count}")
     
-    print(f"Entries with exclude='false': {len(exclude_false)}")
-    print(f"Entries with exclude='true': {len(exclude_true)}")
+    # Already ordered when the first false_count entries are all exclude=false
+    if all(entry.get("exclude") == "false" for entry in islice(data, false_count)):
+        print("✅ JSON file is already ordered - nothing to write")
+        return
     
-    # Combine lists with exclude=false first
-    reordered_data = exclude_false + exclude_true
+    # Stable in-place sort with exclude=false first
+    data.sort(key=lambda entry: 0 if entry.get("exclude") == "false" else 1)
     
-    # Write the reordered JSON back to the file
+    # Write the reordered JSON to a temp file and swap it in atomically
     print(f"Writing reordered data to {input_file}...")
-    with open(input_file, 'w', encoding='utf-8') as f:
-        json.dump(reordered_data, f, indent=2, ensure_ascii=False)
+    write_json(input_file, data)
     
     print("✅ JSON file successfully reordered!")
-    print(f"   - {len(exclude_false)} entries with exclude='false' at the top")
-    print(f"   - {len(exclude_true)} entries with exclude='true' at the bottom")
+    print(f"   - {false_count} entries with exclude='false' at the top")
+    print(f"   - {true_count} entries with exclude='true' at the bottom")
 
 if __name__ == "__main__":
     reorder_json_by_exclude()
@@ -1,33 +1,35 @@
-import json
 import sys
 
+from json_io import load_json, write_json
+
 def reorder_json():
     try:
         # Read the JSON file
         print("Reading group_titles_with_flags.json...")
-        with open("group_titles_with_flags.json", 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json("group_titles_with_flags.json")
         
         print(f"Loaded {len(data)} entries")
         
-        # Count current distribution
-        false_entries = []
-        true_entries = []
+        # Bucket entries by exclude value in a single stable pass
+        buckets = {"false": [], "true": []}
+        get_bucket = buckets.get
         
         for entry in data:
             exclude_value = entry.get("exclude")
-            if exclude_value == "false":
-                false_entries.append(entry)
-            elif exclude_value == "true":
-                true_entries.append(entry)
-            else:
+            bucket = get_bucket(exclude_value)
+            if bucket is None:
                 print(f"Warning: Unexpected exclude value '{exclude_value}' for {entry.get('group_title')}")
+                continue
+            bucket.append(entry)
         
-        print(f"Found {len(false_entries)} entries with exclude='false'")
-        print(f"Found {len(true_entries)} entries with exclude='true'")
+        false_count = len(buckets["false"])
+        true_count = len(buckets["true"])
+        print(f"Found {false_count} entries with exclude='false'")
+        print(f"Found {true_count} entries with exclude='true'")
         
-        # Create reordered list: false entries first, then true entries
-        reordered_data = false_entries + true_entries
+        # Reordered list: false entries first, extended in place with true entries
+        reordered_data = buckets["false"]
+        reordered_data.extend(buckets["true"])
         
         print(f"Reordered list has {len(reordered_data)} entries")
         
@@ -38,12 +40,11 @@ def reorder_json():
         
         # Write back to file
         print("Writing reordered data back to file...")
-        with open("group_titles_with_flags.json", 'w', encoding='utf-8') as f:
-            json.dump(reordered_data, f, indent=2, ensure_ascii=False)
+        write_json("group_titles_with_flags.json", reordered_data)
         
         print("✅ Successfully reordered JSON file!")
-        print(f"   • {len(false_entries)} entries with exclude='false' are now at the top")
-        print(f"   • {len(true_entries)} entries with exclude='true' are now at the bottom")
+        print(f"   • {false_count} entries with exclude='false' are now at the top")
+        print(f"   • {true_count} entries with exclude='true' are now at the bottom")
         
     except Exception as e:
         print(f"❌ Error: {e}")
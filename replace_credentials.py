@@ -4,50 +4,34 @@ M3U Credential Replacement Script
 This script replaces DNS, USERNAME, and PASSWORD placeholders in M3U files
 based on configuration from a JSON file.
 """
+import copy
 import json
+import mmap
 import re
+import shutil
+import subprocess
 import sys
 import os
+from functools import lru_cache
 from pathlib import Path
 
+from json_io import load_json
+
+# Inputs larger than this are handed to sed when it is available (50 MiB)
+SED_MIN_BYTES = 50 << 20
+
+# Block size used when counting lines in the mapped playlist
+COUNT_CHUNK_SIZE = 1 << 20
+
+# Matches once per line that contains http:// and at least one placeholder
+URL_WITH_PLACEHOLDER_PATTERN = re.compile(rb'^(?=[^\n]*http://)[^\n]*?(?:DNS|USERNAME|PASSWORD)', re.MULTILINE)
+
 def load_config(config_file):
-    """Load configuration from JSON file"""
+    """Load and validate configuration from JSON file, reusing the parsed result while the file is unchanged"""
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # Check if it's a single credential object or an array
-        if isinstance(config, dict):
-            # Single credential object - convert to array for consistent processing
-            if all(field in config for field in ['dns', 'username', 'password']):
-                return [config]
-            else:
-                print(f"❌ Missing required fields in config. Required: dns, username, password")
-                return None
-        elif isinstance(config, list):
-            # Multiple credential objects
-            valid_configs = []
-            for i, cred in enumerate(config):
-                if not isinstance(cred, dict):
-                    print(f"❌ Entry {i+1} is not a valid credential object")
-                    continue
-                
-                missing_fields = [field for field in ['dns', 'username', 'password'] if field not in cred]
-                if missing_fields:
-                    print(f"❌ Entry {i+1} missing required fields: {', '.join(missing_fields)}")
-                    continue
-                
-                valid_configs.append(cred)
-            
-            if not valid_configs:
-                print(f"❌ No valid credential entries found")
-                return None
-            
-            return valid_configs
-        else:
-            print(f"❌ Config must be either a credential object or an array of credential objects")
-            return None
-    
+        mtime_ns = os.stat(config_file).st_mtime_ns
+        # Copy the cached parse so a caller editing its config never changes later loads
+        config = copy.deepcopy(_parse_config_cached(config_file, mtime_ns))
     except FileNotFoundError:
         print(f"❌ Config file not found: {config_file}")
         return None
@@ -57,48 +41,136 @@ def load_config(config_file):
     except Exception as e:
         print(f"❌ Error loading config: {e}")
         return None
+    
+    # Check if it's a single credential object or an array
+    if isinstance(config, dict):
+        # Single credential object - convert to array for consistent processing
+        if all(field in config for field in ['dns', 'username', 'password']):
+            return [config]
+        else:
+            print(f"❌ Missing required fields in config. Required: dns, username, password")
+            return None
+    elif isinstance(config, list):
+        # Multiple credential objects
+        valid_configs = []
+        for i, cred in enumerate(config):
+            if not isinstance(cred, dict):
+                print(f"❌ Entry {i+1} is not a valid credential object")
+                continue
+            
+            missing_fields = [field for field in ['dns', 'username', 'password'] if field not in cred]
+            if missing_fields:
+                print(f"❌ Entry {i+1} missing required fields: {', '.join(missing_fields)}")
+                continue
+            
+            valid_configs.append(cred)
+        
+        if not valid_configs:
+            print(f"❌ No valid credential entries found")
+            return None
+        
+        return valid_configs
+    else:
+        print(f"❌ Config must be either a credential object or an array of credential objects")
+        return None
+
+@lru_cache(maxsize=8)
+def _parse_config_cached(config_file, mtime_ns):
+    """Parse the config file; cached per (path, mtime), validation runs on every load"""
+    return load_json(config_file)
 
-def replace_credentials(line, config):
-    """Replace DNS, USERNAME, and PASSWORD in a single line"""
-    # Replace placeholders with actual values
-    line = line.replace('DNS', config['dns'])
-    line = line.replace('USERNAME', config['username'])
-    line = line.replace('PASSWORD', config['password'])
+def build_credential_replacer(config):
+    """Build a function that replaces DNS, USERNAME, and PASSWORD in UTF-8 bytes"""
+    # Encode once per config; chained bytes.replace beats a regex callback per match
+    dns = config['dns'].encode('utf-8')
+    username = config['username'].encode('utf-8')
+    password = config['password'].encode('utf-8')
     
-    return line
+    def replace_credentials(data):
+        return data.replace(b'DNS', dns).replace(b'USERNAME', username).replace(b'PASSWORD', password)
+    
+    return replace_credentials
+
+def sed_escape(value):
+    """Escape a replacement string for a sed s||| expression"""
+    return value.replace('\\', '\\\\').replace('&', '\\&').replace('|', '\\|')
+
+def process_m3u_file_sed(input_file, output_file, config):
+    """Replace credentials by piping the playlist through sed; returns False to fall back"""
+    sed = shutil.which('sed')
+    if not sed:
+        return False
+    values = [config['dns'], config['username'], config['password']]
+    if any('\n' in value for value in values):
+        return False  # Multi-line replacements cannot be expressed in a sed expression
+    dns, username, password = (sed_escape(value) for value in values)
+    
+    # sed writes a temp file that only replaces output_file once it exits cleanly
+    tmp_file = output_file + '.tmp'
+    try:
+        with open(tmp_file, 'wb') as out_f:
+            subprocess.run(
+                [sed, '-e', f's|DNS|{dns}|g', '-e', f's|USERNAME|{username}|g',
+                 '-e', f's|PASSWORD|{password}|g', input_file],
+                stdout=out_f, check=True, env={**os.environ, 'LC_ALL': 'C'},
+            )
+        os.replace(tmp_file, output_file)
+    except (OSError, subprocess.CalledProcessError) as e:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        print(f"⚠️  sed failed ({e}), falling back to Python")
+        return False
+    
+    # Replacement values hold no newlines, so the input's line and URL counts match the output's
+    with open(input_file, 'rb') as in_f:
+        input_size = os.fstat(in_f.fileno()).st_size
+        with mmap.mmap(in_f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            line_count = sum(mm[i:i + COUNT_CHUNK_SIZE].count(b'\n') for i in range(0, input_size, COUNT_CHUNK_SIZE))
+            if mm[input_size - 1:input_size] != b'\n':
+                line_count += 1  # Final line without a trailing newline
+            url_replacements = len(URL_WITH_PLACEHOLDER_PATTERN.findall(mm))
+    
+    print(f"✅ Created {output_file} ({line_count} lines)")
+    print(f"📊 Replaced credentials in {url_replacements} URLs")
+    print(f"📏 Input file size: {input_size:,} bytes")
+    print(f"📏 Output file size: {os.path.getsize(output_file):,} bytes")
+    return True
 
 def process_m3u_file(input_file, output_file, config):
     """Process M3U file and replace credentials"""
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        print(f"📖 Reading {input_file}")
         
-        print(f"📖 Reading {input_file} ({len(lines)} lines)")
+        # Huge playlists go through sed, which avoids interpreter overhead entirely
+        if os.path.getsize(input_file) > SED_MIN_BYTES and process_m3u_file_sed(input_file, output_file, config):
+            return True
         
-        # Process each line
-        processed_lines = []
-        url_replacements = 0
+        # Map the playlist and substitute over the raw bytes, no per-line decode
+        replace_credentials = build_credential_replacer(config)
+        with open(input_file, 'rb') as in_f:
+            input_size = os.fstat(in_f.fileno()).st_size
+            if input_size:
+                with mmap.mmap(in_f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    output = replace_credentials(mm[:])
+                    url_replacements = len(URL_WITH_PLACEHOLDER_PATTERN.findall(mm))
+            else:
+                output = b''
+                url_replacements = 0
         
-        for i, line in enumerate(lines):
-            original_line = line
-            processed_line = replace_credentials(line, config)
-            
-            # Count URL replacements (lines containing http://)
-            if 'http://' in original_line and original_line != processed_line:
-                url_replacements += 1
-            
-            processed_lines.append(processed_line)
+        with open(output_file, 'wb') as out_f:
+            out_f.write(output)
         
-        # Write processed file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.writelines(processed_lines)
+        line_count = output.count(b'\n')
+        if output and not output.endswith(b'\n'):
+            line_count += 1  # Final line without a trailing newline
         
-        print(f"✅ Created {output_file}")
+        print(f"✅ Created {output_file} ({line_count} lines)")
         print(f"📊 Replaced credentials in {url_replacements} URLs")
         
-        # Calculate file sizes
-        input_size = os.path.getsize(input_file)
-        output_size = os.path.getsize(output_file)
+        # File sizes are already known from the mapping and the output buffer
+        output_size = len(output)
         
         print(f"📏 Input file size: {input_size:,} bytes")
         print(f"📏 Output file size: {output_size:,} bytes")
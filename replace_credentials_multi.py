@@ -4,50 +4,37 @@ M3U Credential Replacement Script
 This script replaces DNS, USERNAME, and PASSWORD placeholders in M3U files
 based on configuration from a JSON file. Supports multiple credential sets.
 """
+import copy
 import json
 import re
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+from json_io import load_json
+
+# Buffer size for playlist file I/O (1 MiB)
+IO_BUFFER_SIZE = 1 << 20
+
+# Inputs smaller than this are processed in-process; worker startup would dominate
+PARALLEL_MIN_BYTES = 8 << 20
+
+# Legacy server host that is rewritten to the configured DNS
+LEGACY_DNS = 'wealth76175.cdn-akm.me'
+
+# Detects lines that carry any placeholder (lines are UTF-8 bytes)
+PLACEHOLDER_PATTERN = re.compile(b'|'.join(
+    re.escape(placeholder.encode('utf-8')) for placeholder in ['DNS', LEGACY_DNS, 'USERNAME', 'PASSWORD']
+))
+
 def load_config(config_file):
-    """Load configuration from JSON file"""
+    """Load and validate configuration from JSON file, reusing the parsed result while the file is unchanged"""
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # Check if it's a single credential object or an array
-        if isinstance(config, dict):
-            # Single credential object - convert to array for consistent processing
-            if all(field in config for field in ['dns', 'username', 'password']):
-                return [config]
-            else:
-                print(f"❌ Missing required fields in config. Required: dns, username, password")
-                return None
-        elif isinstance(config, list):
-            # Multiple credential objects
-            valid_configs = []
-            for i, cred in enumerate(config):
-                if not isinstance(cred, dict):
-                    print(f"❌ Entry {i+1} is not a valid credential object")
-                    continue
-                
-                missing_fields = [field for field in ['dns', 'username', 'password'] if field not in cred]
-                if missing_fields:
-                    print(f"❌ Entry {i+1} missing required fields: {', '.join(missing_fields)}")
-                    continue
-                
-                valid_configs.append(cred)
-            
-            if not valid_configs:
-                print(f"❌ No valid credential entries found")
-                return None
-            
-            return valid_configs
-        else:
-            print(f"❌ Config must be either a credential object or an array of credential objects")
-            return None
-    
+        mtime_ns = os.stat(config_file).st_mtime_ns
+        # Copy the cached parse so a caller editing its config never changes later loads
+        config = copy.deepcopy(_parse_config_cached(config_file, mtime_ns))
     except FileNotFoundError:
         print(f"❌ Config file not found: {config_file}")
         return None
@@ -57,60 +44,178 @@ def load_config(config_file):
     except Exception as e:
         print(f"❌ Error loading config: {e}")
         return None
+    
+    # Check if it's a single credential object or an array
+    if isinstance(config, dict):
+        # Single credential object - convert to array for consistent processing
+        if all(field in config for field in ['dns', 'username', 'password']):
+            return [config]
+        else:
+            print(f"❌ Missing required fields in config. Required: dns, username, password")
+            return None
+    elif isinstance(config, list):
+        # Multiple credential objects
+        valid_configs = []
+        for i, cred in enumerate(config):
+            if not isinstance(cred, dict):
+                print(f"❌ Entry {i+1} is not a valid credential object")
+                continue
+            
+            missing_fields = [field for field in ['dns', 'username', 'password'] if field not in cred]
+            if missing_fields:
+                print(f"❌ Entry {i+1} missing required fields: {', '.join(missing_fields)}")
+                continue
+            
+            valid_configs.append(cred)
+        
+        if not valid_configs:
+            print(f"❌ No valid credential entries found")
+            return None
+        
+        return valid_configs
+    else:
+        print(f"❌ Config must be either a credential object or an array of credential objects")
+        return None
 
-def replace_credentials(line, config):
-    """Replace DNS, USERNAME, and PASSWORD in a single line"""
-    # Replace placeholders with actual values
-    line = line.replace('DNS', config['dns'])
-    line = line.replace('wealth76175.cdn-akm.me', config['dns'])
-    line = line.replace('USERNAME', config['username'])
-    line = line.replace('PASSWORD', config['password'])
-    
-    return line
+@lru_cache(maxsize=8)
+def _parse_config_cached(config_file, mtime_ns):
+    """Parse the config file; cached per (path, mtime), validation runs on every load"""
+    return load_json(config_file)
 
-def process_m3u_file(input_file, output_file, config):
-    """Process M3U file and replace credentials"""
+def build_credential_replacer(config):
+    """Build a function that replaces DNS, USERNAME, and PASSWORD in a single UTF-8 line"""
+    # Encode once per config; chained bytes.replace beats a regex callback per match
+    dns = config['dns'].encode('utf-8')
+    legacy_dns = LEGACY_DNS.encode('utf-8')
+    username = config['username'].encode('utf-8')
+    password = config['password'].encode('utf-8')
+    
+    def replace_credentials(line):
+        return line.replace(b'DNS', dns).replace(legacy_dns, dns).replace(b'USERNAME', username).replace(b'PASSWORD', password)
+    
+    return replace_credentials
+
+def process_m3u_file(input_file, output_files):
+    """Process M3U file once and write a credential-replaced copy per output file
+    
+    output_files maps each output filename to its credential config.
+    Returns the list of output files that were written successfully.
+    """
+    # [output_file, out_f, replace_credentials, out_buf, output_size]
+    targets = []
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        print(f"   📖 Reading {input_file} ({len(lines)} lines)")
-        
-        # Process each line
-        processed_lines = []
-        url_replacements = 0
-        
-        for i, line in enumerate(lines):
-            original_line = line
-            processed_line = replace_credentials(line, config)
+        # Open the input first so an unreadable input never touches existing outputs
+        with open(input_file, 'rb', buffering=IO_BUFFER_SIZE) as in_f:
+            # Open every output up front so the input is only read once.
+            # Each is written to a .tmp sibling and swapped in only after a full pass.
+            for output_file, config in output_files.items():
+                try:
+                    out_f = open(output_file + '.tmp', 'wb', buffering=IO_BUFFER_SIZE)
+                except OSError as e:
+                    print(f"   ❌ Cannot create {output_file}: {e}")
+                    continue
+                targets.append([output_file, out_f, build_credential_replacer(config), bytearray(), 0])
             
-            # Count URL replacements (lines containing http://)
-            if 'http://' in original_line and original_line != processed_line:
-                url_replacements += 1
+            if not targets:
+                return []
             
-            processed_lines.append(processed_line)
-        
-        # Write processed file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.writelines(processed_lines)
-        
-        print(f"   ✅ Created {output_file}")
-        print(f"   📊 Replaced credentials in {url_replacements} URLs")
-        
-        # Calculate file sizes
-        input_size = os.path.getsize(input_file)
-        output_size = os.path.getsize(output_file)
+            print(f"   📖 Reading {input_file}")
+            line_count = 0
+            url_replacements = 0
+            search_placeholder = PLACEHOLDER_PATTERN.search
+            
+            def flush(target):
+                """Write out a target's accumulated bytes and reuse its buffer"""
+                out_buf = target[3]
+                target[1].write(out_buf)
+                target[4] += len(out_buf)
+                out_buf.clear()
+            
+            # Work on raw bytes so sizes are known without stat-ing the outputs.
+            # Each output accumulates into one reusable bytearray flushed in ~1 MiB blocks.
+            for line in in_f:
+                line_count += 1
+                
+                # Lines without a placeholder are identical for every credential set
+                if not search_placeholder(line):
+                    for target in targets:
+                        target[3] += line
+                        if len(target[3]) >= IO_BUFFER_SIZE:
+                            flush(target)
+                    continue
+                
+                # Count URL replacements (lines containing http:// and a placeholder)
+                if b'http://' in line:
+                    url_replacements += 1
+                
+                # Fan the line out to every credential set
+                for target in targets:
+                    target[3] += target[2](line)
+                    if len(target[3]) >= IO_BUFFER_SIZE:
+                        flush(target)
+            
+            for target in targets:
+                flush(target)
         
-        print(f"   📏 Output file size: {output_size:,} bytes")
+        created_files = []
+        report = []
+        for output_file, out_f, _, _, output_size in targets:
+            out_f.close()
+            os.replace(output_file + '.tmp', output_file)
+            
+            report.append(
+                f"   ✅ Created {output_file} ({line_count} lines)\n"
+                f"   📊 Replaced credentials in {url_replacements} URLs\n"
+                f"   📏 Output file size: {output_size:,} bytes\n"
+            )
+            created_files.append(output_file)
         
-        return True
+        # Single write keeps worker reports from interleaving line by line
+        sys.stdout.write("".join(report))
+        return created_files
         
     except FileNotFoundError:
         print(f"   ❌ Input file not found: {input_file}")
-        return False
+        return []
     except Exception as e:
         print(f"   ❌ Error processing file: {e}")
-        return False
+        return []
+    finally:
+        # A failed run keeps the previous playlists; drop any unfinished temp files
+        for target in targets:
+            target[1].close()
+            try:
+                os.remove(target[0] + '.tmp')
+            except OSError:
+                pass
+
+def process_m3u_file_parallel(input_file, output_files):
+    """Split output files across worker processes, each doing its own single-pass fan-out
+    
+    Returns the list of output files that were written successfully.
+    """
+    workers = min(len(output_files), os.cpu_count() or 1)
+    try:
+        large_input = os.path.getsize(input_file) >= PARALLEL_MIN_BYTES
+    except OSError:
+        large_input = False
+    
+    if workers <= 1 or not large_input:
+        return process_m3u_file(input_file, output_files)
+    
+    items = list(output_files.items())
+    groups = [dict(items[i::workers]) for i in range(workers)]
+    
+    print(f"   ⚡ Using {workers} worker processes")
+    # Flush so forked workers do not re-emit buffered output
+    sys.stdout.flush()
+    
+    created_files = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for group_created in executor.map(process_m3u_file, [input_file] * workers, groups):
+            created_files.extend(group_created)
+    
+    return created_files
 
 def find_config_file(filename):
     """Find config file using config-first approach (like container)"""
@@ -178,38 +283,44 @@ def main():
     print(f"🔧 Found {len(configs)} credential set(s) to process")
     print(f"❌ Input file: {input_file}")
     
-    # Process each credential set
-    all_success = True
-    created_files = []
+    # Collect every credential set, then process them in a single input pass
+    output_files = {}
     
     for i, config in enumerate(configs, 1):
-        print(f"\n{'='*50}")
-        print(f"🔄 Processing credential set {i}/{len(configs)}")
-        print(f"   DNS: {config['dns']}")
-        print(f"   Username: {config['username']}")
-        print(f"   Password: {'*' * len(config['password'])}")
-        
         # Generate output filename based on username
         output_file = f"8k_{config['username']}.m3u"
         
-        print(f"   Output: {output_file}")
-        
-        # Process the file
-        success = process_m3u_file(input_file, output_file, config)
+        # One write per credential set instead of one per status line
+        sys.stdout.write(
+            f"\n{'='*50}\n"
+            f"🔄 Credential set {i}/{len(configs)}\n"
+            f"   DNS: {config['dns']}\n"
+            f"   Username: {config['username']}\n"
+            f"   Password: {'*' * len(config['password'])}\n"
+            f"   Output: {output_file}\n"
+        )
         
-        if success:
-            created_files.append(output_file)
-            print(f"   ✅ SUCCESS: {output_file}")
-        else:
-            print(f"   ❌ FAILED: {output_file}")
-            all_success = False
+        # A repeated username overwrites the earlier output, as before
+        output_files.pop(output_file, None)
+        output_files[output_file] = config
+    
+    print(f"\n{'='*50}")
+    print(f"🔄 Processing {len(output_files)} output file(s) in a single pass")
+    created_files = process_m3u_file_parallel(input_file, output_files)
+    
+    sys.stdout.write("".join(
+        f"   ✅ SUCCESS: {output_file}\n" if output_file in created_files else f"   ❌ FAILED: {output_file}\n"
+        for output_file in output_files
+    ))
+    
+    all_success = len(created_files) == len(output_files)
     
     # Final summary
     print(f"\n{'='*50}")
     print(f"📊 PROCESSING SUMMARY")
     print(f"   Total credential sets: {len(configs)}")
     print(f"   Successful: {len(created_files)}")
-    print(f"   Failed: {len(configs) - len(created_files)}")
+    print(f"   Failed: {len(output_files) - len(created_files)}")
     
     if created_files:
         print(f"\n✅ Files created:")
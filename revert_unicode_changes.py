@@ -3,32 +3,37 @@
 Revert Unicode emoji changes - restore original emojis that were working before
 """
 
+import re
+
+# Text to emoji mapping (reverse of what we did)
+REVERSIONS = {
+    "[ERROR]": "❌",
+    "[SUCCESS]": "✅", 
+    "[INFO]": "📋",
+    "[CHECK]": "🔍",
+    "[TIP]": "💡",
+    "[STATS]": "📊",
+    "[MERGE]": "🔧",
+    "[START]": "🚀",
+    "[FILE]": "📁",
+    "[OVERRIDE]": "🏷️",
+    "[TARGET]": "🎯",
+    "[TIME]": "⏱️",
+    "[SKIP]": "⏭️",
+    "[PROCESS]": "🔄",
+    "[CMD]": "📝",
+    "[OUTPUT]": "📤",
+    "[WARNING]": "⚠️",
+    "[UK]": "🇬🇧",
+    "[US]": "🇺🇸"
+}
+
+# All reversion tags matched in a single pass per file
+REVERSION_PATTERN = re.compile('|'.join(map(re.escape, REVERSIONS)))
+
 def revert_unicode_changes():
     """Revert text replacements back to original emojis"""
     
-    # Text to emoji mapping (reverse of what we did)
-    reversions = {
-        "[ERROR]": "❌",
-        "[SUCCESS]": "✅", 
-        "[INFO]": "📋",
-        "[CHECK]": "🔍",
-        "[TIP]": "💡",
-        "[STATS]": "📊",
-        "[MERGE]": "🔧",
-        "[START]": "🚀",
-        "[FILE]": "📁",
-        "[OVERRIDE]": "🏷️",
-        "[TARGET]": "🎯",
-        "[TIME]": "⏱️",
-        "[SKIP]": "⏭️",
-        "[PROCESS]": "🔄",
-        "[CMD]": "📝",
-        "[OUTPUT]": "📤",
-        "[WARNING]": "⚠️",
-        "[UK]": "🇬🇧",
-        "[US]": "🇺🇸"
-    }
-    
     # Files to revert
     files_to_revert = [
         "merge_247_channels.py",
@@ -52,13 +57,11 @@ def revert_unicode_changes():
             print(f"❌ Error reading {filename}: {e}")
             continue
         
-        # Apply reversions
-        original_content = content
-        for text, emoji in reversions.items():
-            content = content.replace(text, emoji)
+        # Apply all reversions in one scan
+        content, replacements = REVERSION_PATTERN.subn(lambda m: REVERSIONS[m.group(0)], content)
         
         # Check if any changes were made
-        changes_made = content != original_content
+        changes_made = replacements > 0
         
         if changes_made:
             # Write back the file
@@ -6,6 +6,9 @@ No browser required - uses service accounts or pre-authenticated tokens
 import os
 import json
 import base64
+import filecmp
+import shutil
+from functools import lru_cache
 
 def setup_container_auth():
     """Setup Google Drive authentication for containers (no browser needed)"""
@@ -73,6 +76,11 @@ def check_service_account():
     print("❌ No valid service account found")
     return False
 
+@lru_cache(maxsize=2)
+def decode_environment_token(encoded_token):
+    """Decode a base64 GDRIVE_TOKEN_B64 payload; cached since the env var is fixed per process"""
+    return json.loads(base64.b64decode(encoded_token).decode())
+
 def check_environment_token():
     """Check if environment-based token is available"""
     print("🔍 Checking for Environment token...")
@@ -81,14 +89,13 @@ def check_environment_token():
     encoded_token = os.getenv('GDRIVE_TOKEN_B64')
     if encoded_token:
         try:
-            token_json = base64.b64decode(encoded_token).decode()
-            token_data = json.loads(token_json)
+            token_data = decode_environment_token(encoded_token)
             
             # Write token to file
-            with open('gdrive_token.json', 'w') as f:
-                json.dump(token_data, f)
-            
-            print("✅ Environment token decoded and saved")
+            if write_token_file(token_data, 'gdrive_token.json'):
+                print("✅ Environment token decoded and saved")
+            else:
+                print("✅ Environment token decoded - saved token already up to date")
             return True
         except Exception as e:
             print(f"⚠️  Failed to decode environment token: {e}")
@@ -99,10 +106,10 @@ def check_environment_token():
         try:
             token_data = json.loads(token_json)
             
-            with open('gdrive_token.json', 'w') as f:
-                json.dump(token_data, f)
-            
-            print("✅ Environment JSON token saved")
+            if write_token_file(token_data, 'gdrive_token.json'):
+                print("✅ Environment JSON token saved")
+            else:
+                print("✅ Environment JSON token already up to date")
             return True
         except Exception as e:
             print(f"⚠️  Failed to parse environment JSON token: {e}")
@@ -123,9 +130,10 @@ def check_mounted_token():
         if os.path.exists(mounted_path):
             try:
                 # Copy token file to working directory
-                import shutil
-                shutil.copy2(mounted_path, 'gdrive_token.json')
-                print(f"✅ Copied token from: {mounted_path}")
+                if copy_token_file(mounted_path, 'gdrive_token.json'):
+                    print(f"✅ Copied token from: {mounted_path}")
+                else:
+                    print(f"✅ Token from {mounted_path} already up to date")
                 return True
             except Exception as e:
                 print(f"⚠️  Failed to copy {mounted_path}: {e}")
@@ -133,6 +141,52 @@ def check_mounted_token():
     print("❌ No mounted token files found")
     return False
 
+def write_token_file(token_data, dest_path):
+    """Atomically write token JSON, skipping the write when the file already matches
+    
+    Returns True if the file was written.
+    """
+    content = json.dumps(token_data).encode()
+    try:
+        with open(dest_path, 'rb') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    
+    temp_path = dest_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+    os.replace(temp_path, dest_path)
+    return True
+
+def copy_token_file(source_path, dest_path):
+    """Atomically copy a token file using in-kernel sendfile where the platform supports it
+    
+    Returns True if the file was copied, False if the destination already matches.
+    """
+    if os.path.exists(dest_path) and filecmp.cmp(source_path, dest_path, shallow=False):
+        return False
+    
+    temp_path = dest_path + '.tmp'
+    with open(source_path, 'rb') as src, open(temp_path, 'wb') as dst:
+        size = os.fstat(src.fileno()).st_size
+        try:
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # No sendfile (e.g. Windows) or unsupported file types - copy in userspace
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+            shutil.copyfileobj(src, dst)
+    os.replace(temp_path, dest_path)
+    return True
+
 def print_setup_instructions():
     """Print instructions for setting up container authentication"""
     print("\n🛠️  Container Authentication Setup Required")
@@ -6,12 +6,49 @@ This script guides you through setting up Google Drive OAuth credentials.
 
 import os
 import json
-import webbrowser
+import re
 from urllib.parse import quote
 
-def create_instructions():
-    """Create detailed setup instructions"""
-    instructions = """
+from gdrive_common import cached_json
+from json_io import load_json
+
+# Placeholder values left over from the example credentials file
+TEMPLATE_PATTERN = re.compile(r'your-(?:client-id|client-secret|project)')
+
+# Remembers the credentials file that last passed validation by inode, mtime and size
+CREDENTIALS_SENTINEL_FILE = '.gdrive_credentials.ok'
+
+def load_validated_client_id(creds_file, st):
+    """Return the cached client ID if creds_file is unchanged since it last passed validation"""
+    try:
+        sentinel = load_json(CREDENTIALS_SENTINEL_FILE)
+    except (OSError, ValueError):
+        return None
+    if (isinstance(sentinel, dict)
+            and sentinel.get('path') == creds_file
+            and sentinel.get('ino') == st.st_ino
+            and sentinel.get('mtime_ns') == st.st_mtime_ns
+            and sentinel.get('size') == st.st_size):
+        return sentinel.get('client_id')
+    return None
+
+def save_validated_client_id(creds_file, st, client_id):
+    """Record that creds_file passed validation so unchanged files can skip it next time"""
+    sentinel = {
+        'path': creds_file,
+        'ino': st.st_ino,
+        'mtime_ns': st.st_mtime_ns,
+        'size': st.st_size,
+        'client_id': client_id,
+    }
+    try:
+        with open(CREDENTIALS_SENTINEL_FILE, 'w') as f:
+            json.dump(sentinel, f)
+    except OSError:
+        pass  # Sentinel is only an optimization
+
+# Setup walkthrough shown by --instructions and the interactive menu
+INSTRUCTIONS = """
 🔧 GOOGLE DRIVE CREDENTIALS SETUP
 =====================================
 
@@ -74,43 +111,43 @@ You need to create OAuth 2.0 credentials from Google Cloud Console to use Google
    - Make sure you're logged into the correct Google account
    - The credentials file must be named exactly: gdrive_credentials.json
 """
-    return instructions
 
-def open_google_console():
-    """Open Google Cloud Console in browser"""
-    console_url = "https://console.cloud.google.com/"
+def create_instructions():
+    """Create detailed setup instructions"""
+    return INSTRUCTIONS
+
+def open_url(url, label):
+    """Open url in the browser, importing webbrowser only when a page is actually opened"""
+    import webbrowser
     try:
-        webbrowser.open(console_url)
-        print(f"🌐 Opening Google Cloud Console: {console_url}")
+        webbrowser.open(url)
+        print(f"🌐 Opening {label}: {url}")
         return True
     except Exception as e:
         print(f"❌ Could not open browser: {e}")
-        print(f"📋 Please manually open: {console_url}")
+        print(f"📋 Please manually open: {url}")
         return False
 
+def open_google_console():
+    """Open Google Cloud Console in browser"""
+    return open_url("https://console.cloud.google.com/", "Google Cloud Console")
+
 def open_apis_library():
     """Open Google APIs Library"""
-    apis_url = "https://console.cloud.google.com/apis/library"
-    try:
-        webbrowser.open(apis_url)
-        print(f"🌐 Opening APIs Library: {apis_url}")
-        return True
-    except Exception as e:
-        print(f"❌ Could not open browser: {e}")
-        print(f"📋 Please manually open: {apis_url}")
-        return False
+    return open_url("https://console.cloud.google.com/apis/library", "APIs Library")
 
 def open_drive_api():
     """Open Drive API page"""
-    drive_api_url = "https://console.cloud.google.com/apis/library/drive.googleapis.com"
-    try:
-        webbrowser.open(drive_api_url)
-        print(f"🌐 Opening Drive API page: {drive_api_url}")
-        return True
-    except Exception as e:
-        print(f"❌ Could not open browser: {e}")
-        print(f"📋 Please manually open: {drive_api_url}")
-        return False
+    return open_url("https://console.cloud.google.com/apis/library/drive.googleapis.com", "Drive API page")
+
+def find_credentials_problem(data):
+    """Return a description of what is wrong with the credentials structure, or None"""
+    if "installed" not in data:
+        return "has wrong structure"
+    installed = data["installed"]
+    if not installed.get("client_id", "") or not installed.get("client_secret", ""):
+        return "missing required fields"
+    return None
 
 def check_credentials_file():
     """Check if credentials file exists and is valid"""
@@ -131,29 +168,35 @@ def check_credentials_file():
         return False
     
     try:
-        with open(creds_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        st = os.stat(creds_file)
+        client_id = load_validated_client_id(creds_file, st)
+        if client_id:
+            print(f"✅ {creds_file} found and appears valid (unchanged since last check)")
+            print(f"   Client ID: {client_id[:20]}...")
+            if creds_file == root_creds:
+                print("💡 Consider moving to config/gdrive_credentials.json for better organization")
+            return True
+        
+        data = cached_json(creds_file)
         
         # Check if it has the required structure
-        if "installed" in data:
-            client_id = data["installed"].get("client_id", "")
-            client_secret = data["installed"].get("client_secret", "")
-            
-            if client_id and client_secret:
-                if "your-client-id" not in client_id and "your-client-secret" not in client_secret:
-                    print(f"✅ {creds_file} found and appears valid")
-                    print(f"   Client ID: {client_id[:20]}...")
-                    if creds_file == root_creds:
-                        print("💡 Consider moving to config/gdrive_credentials.json for better organization")
-                    return True
-                else:
-                    print(f"❌ {creds_file} contains template values - need real credentials")
-                    return False
-            else:
-                print(f"❌ {creds_file} missing required fields")
-                return False
+        problem = find_credentials_problem(data)
+        if problem:
+            print(f"❌ {creds_file} {problem}")
+            return False
+        
+        client_id = data["installed"]["client_id"]
+        client_secret = data["installed"]["client_secret"]
+        
+        if not TEMPLATE_PATTERN.search(client_id) and not TEMPLATE_PATTERN.search(client_secret):
+            save_validated_client_id(creds_file, st, client_id)
+            print(f"✅ {creds_file} found and appears valid")
+            print(f"   Client ID: {client_id[:20]}...")
+            if creds_file == root_creds:
+                print("💡 Consider moving to config/gdrive_credentials.json for better organization")
+            return True
         else:
-            print(f"❌ {creds_file} has wrong structure")
+            print(f"❌ {creds_file} contains template values - need real credentials")
             return False
             
     except json.JSONDecodeError:
@@ -4,9 +4,83 @@ Google Drive Setup for Container Deployment
 This script helps prepare Google Drive authentication for containerized environments.
 """
 import os
-import json
 import shutil
 from pathlib import Path
+from string import Template
+
+from gdrive_common import cached_json, first_existing
+
+# Fields an authorized-user token needs to refresh itself inside the container
+TOKEN_REQUIRED_FIELDS = ['token', 'refresh_token', 'token_uri', 'client_id', 'client_secret']
+
+# docker-compose service that mounts the prepared auth directory read-only
+COMPOSE_TEMPLATE = Template("""version: '3.8'
+
+services:
+  playlist-cleaner:
+    build: .
+    volumes:
+      # Mount pre-authenticated Google Drive credentials (read-only)
+      - $abs_dir:/app/gdrive_auth:ro
+      # Mount data directory for processing
+      - ./data:/app/data
+      # Mount config directory
+      - ./data/config:/app/data/config
+    environment:
+      - GDRIVE_AUTH_DIR=/app/gdrive_auth
+      - PYTHONPATH=/app
+    command: python process_playlist_complete_enhanced.py
+    restart: unless-stopped
+""")
+
+# Entrypoint that copies mounted auth files into place before running the command
+ENTRYPOINT_SCRIPT = '''#!/bin/bash
+# Container entrypoint with Google Drive auth handling
+
+echo "🐳 Starting Playlist Cleaner Container"
+echo "=================================="
+
+# Check for mounted Google Drive authentication
+if [ -d "/app/gdrive_auth" ]; then
+    echo "📁 Google Drive auth directory found"
+    
+    # Copy auth files to expected locations
+    if [ -f "/app/gdrive_auth/gdrive_token.json" ]; then
+        echo "📋 Copying Google Drive token..."
+        cp /app/gdrive_auth/gdrive_token.json /app/gdrive_token.json
+        chmod 600 /app/gdrive_token.json
+    fi
+    
+    if [ -f "/app/gdrive_auth/gdrive_credentials.json" ]; then
+        echo "📋 Copying Google Drive credentials..."
+        cp /app/gdrive_auth/gdrive_credentials.json /app/gdrive_credentials.json
+        chmod 600 /app/gdrive_credentials.json
+    fi
+    
+    echo "✅ Google Drive authentication configured"
+else
+    echo "⚠️  No Google Drive auth found - backup will be skipped"
+fi
+
+# Execute the main command
+echo "🚀 Starting main process..."
+exec "$@"
+'''
+
+def find_missing_token_fields(path):
+    """Return the required token fields absent from the top-level object in path"""
+    token_data = cached_json(path)
+    return [field for field in TOKEN_REQUIRED_FIELDS if field not in token_data]
+
+def _fast_copy(src, dst):
+    """Copy a file inside the kernel (reflink on CoW filesystems), falling back to shutil.copy2"""
+    try:
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            while os.copy_file_range(s.fileno(), d.fileno(), 1 << 20):
+                pass
+        shutil.copystat(src, dst)
+    except (AttributeError, OSError):
+        shutil.copy2(src, dst)
 
 def setup_container_gdrive():
     """Setup Google Drive authentication for container use"""
@@ -17,19 +91,9 @@ def setup_container_gdrive():
     token_files = ['gdrive_token.json', 'data/config/gdrive_token.json']
     creds_files = ['gdrive_credentials.json', 'data/config/gdrive_credentials.json']
     
-    # Find existing token
-    token_source = None
-    for token_file in token_files:
-        if os.path.exists(token_file):
-            token_source = token_file
-            break
-    
-    # Find existing credentials
-    creds_source = None
-    for creds_file in creds_files:
-        if os.path.exists(creds_file):
-            creds_source = creds_file
-            break
+    # Find existing token and credentials
+    token_source = first_existing(token_files)
+    creds_source = first_existing(creds_files)
     
     if not token_source:
         print("❌ No authenticated token found!")
@@ -50,18 +114,16 @@ def setup_container_gdrive():
     
     # Copy files to container directory
     print(f"📋 Copying token from: {token_source}")
-    shutil.copy2(token_source, container_dir / "gdrive_token.json")
+    _fast_copy(token_source, container_dir / "gdrive_token.json")
     
     print(f"📋 Copying credentials from: {creds_source}")
-    shutil.copy2(creds_source, container_dir / "gdrive_credentials.json")
+    _fast_copy(creds_source, container_dir / "gdrive_credentials.json")
     
     # Validate token
     try:
-        with open(container_dir / "gdrive_token.json", 'r') as f:
-            token_data = json.load(f)
+        token_path = str(container_dir / "gdrive_token.json")
         
-        required_fields = ['token', 'refresh_token', 'token_uri', 'client_id', 'client_secret']
-        missing_fields = [field for field in required_fields if field not in token_data]
+        missing_fields = find_missing_token_fields(token_path)
         
         if missing_fields:
             print(f"⚠️  Token missing fields: {missing_fields}")
@@ -89,24 +151,7 @@ def setup_container_gdrive():
 
 def create_docker_compose_gdrive(container_dir):
     """Create docker-compose file with Google Drive authentication"""
-    compose_content = f"""version: '3.8'
-
-services:
-  playlist-cleaner:
-    build: .
-    volumes:
-      # Mount pre-authenticated Google Drive credentials (read-only)
-      - {os.path.abspath(container_dir)}:/app/gdrive_auth:ro
-      # Mount data directory for processing
-      - ./data:/app/data
-      # Mount config directory
-      - ./data/config:/app/data/config
-    environment:
-      - GDRIVE_AUTH_DIR=/app/gdrive_auth
-      - PYTHONPATH=/app
-    command: python process_playlist_complete_enhanced.py
-    restart: unless-stopped
-"""
+    compose_content = COMPOSE_TEMPLATE.substitute(abs_dir=os.path.abspath(container_dir))
     
     with open("docker-compose.gdrive.yml", 'w') as f:
         f.write(compose_content)
@@ -115,41 +160,8 @@ services:
 
 def create_container_entrypoint():
     """Create container entrypoint that handles Google Drive auth"""
-    entrypoint_content = '''#!/bin/bash
-# Container entrypoint with Google Drive auth handling
-
-echo "🐳 Starting Playlist Cleaner Container"
-echo "=================================="
-
-# Check for mounted Google Drive authentication
-if [ -d "/app/gdrive_auth" ]; then
-    echo "📁 Google Drive auth directory found"
-    
-    # Copy auth files to expected locations
-    if [ -f "/app/gdrive_auth/gdrive_token.json" ]; then
-        echo "📋 Copying Google Drive token..."
-        cp /app/gdrive_auth/gdrive_token.json /app/gdrive_token.json
-        chmod 600 /app/gdrive_token.json
-    fi
-    
-    if [ -f "/app/gdrive_auth/gdrive_credentials.json" ]; then
-        echo "📋 Copying Google Drive credentials..."
-        cp /app/gdrive_auth/gdrive_credentials.json /app/gdrive_credentials.json
-        chmod 600 /app/gdrive_credentials.json
-    fi
-    
-    echo "✅ Google Drive authentication configured"
-else
-    echo "⚠️  No Google Drive auth found - backup will be skipped"
-fi
-
-# Execute the main command
-echo "🚀 Starting main process..."
-exec "$@"
-'''
-    
     with open("docker-entrypoint-gdrive.sh", 'w', encoding='utf-8') as f:
-        f.write(entrypoint_content)
+        f.write(ENTRYPOINT_SCRIPT)
     
     # Make executable (on Unix systems)
     try:
@@ -7,21 +7,68 @@ This provides non-interactive authentication suitable for containers and servers
 """
 import os
 import json
+import time
+from importlib.util import find_spec
 from pathlib import Path
 
-try:
-    from google.oauth2 import service_account
-    from googleapiclient.discovery import build
-    GOOGLE_AVAILABLE = True
-except ImportError:
-    GOOGLE_AVAILABLE = False
+from gdrive_common import build_drive_service
+from json_io import load_json, write_json
+
+# Modules that must be importable before the service account can be tested
+GOOGLE_MODULES = ('google.oauth2.service_account', 'googleapiclient.discovery')
+
+# Drive scope requested by the service account
+DRIVE_SCOPES = ('https://www.googleapis.com/auth/drive',)
+
+# Keys that passed a live API check recently, keyed by private_key_id
+VALIDATION_CACHE_FILE = 'data/config/.sa_validated.json'
+VALIDATION_TTL_SECONDS = 3600
+
+def load_validation_cache():
+    """Load the private_key_id -> last live validation timestamp map"""
+    try:
+        cache = load_json(VALIDATION_CACHE_FILE)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def record_validation(key_id):
+    """Remember that key_id passed a live API check now"""
+    if not key_id:
+        return
+    now = time.time()
+    cache = {k: t for k, t in load_validation_cache().items() if now - t < VALIDATION_TTL_SECONDS}
+    cache[key_id] = now
+    try:
+        with open(VALIDATION_CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # Cache is only an optimization
+
+def validate_offline(sa_info):
+    """Return True if the key was validated live within the TTL and still signs locally"""
+    validated_at = load_validation_cache().get(sa_info.get('private_key_id'))
+    if validated_at is None or time.time() - validated_at >= VALIDATION_TTL_SECONDS:
+        return False
+    from google.auth import crypt
+    try:
+        # Minting a signature proves the private key is intact without a network call
+        crypt.RSASigner.from_service_account_info(sa_info).sign(b'playlistcleaner')
+        return True
+    except (KeyError, ValueError):
+        return False
 
 def setup_service_account():
     """Setup Google Drive with service account authentication"""
     print("🔐 Google Drive Service Account Setup")
     print("=" * 40)
     
-    if not GOOGLE_AVAILABLE:
+    # Only locate the Google modules here; they are imported when credentials are first loaded
+    try:
+        google_available = all(find_spec(name) for name in GOOGLE_MODULES)
+    except ImportError:
+        google_available = False  # A parent package such as google is missing
+    if not google_available:
         print("❌ Google API libraries not installed")
         print("💡 Install with: pip install google-auth google-auth-oauthlib google-api-python-client")
         return False
@@ -58,18 +105,20 @@ def setup_service_account():
     try:
         print(f"🔍 Testing service account: {service_account_file}")
         
-        # Load service account credentials
-        credentials = service_account.Credentials.from_service_account_file(
-            service_account_file,
-            scopes=['https://www.googleapis.com/auth/drive']
-        )
+        sa_info = load_json(service_account_file)
         
-        # Test API access
-        service = build('drive', 'v3', credentials=credentials)
-        about = service.about().get(fields='user').execute()
+        if validate_offline(sa_info):
+            print("✅ Service account key verified offline (API check within the last hour)")
+            email = sa_info.get('client_email')
+        else:
+            # Load credentials and build the client (both reused within this process)
+            service = build_drive_service(service_account_file, DRIVE_SCOPES)
+            about = service.about().get(fields='user').execute()
+            record_validation(sa_info.get('private_key_id'))
+            print(f"✅ Service account authenticated successfully!")
+            email = about['user']['emailAddress']
         
-        print(f"✅ Service account authenticated successfully!")
-        print(f"📧 Service account email: {about['user']['emailAddress']}")
+        print(f"📧 Service account email: {email}")
         
         # Create service account config
         create_service_account_config(service_account_file)
@@ -92,8 +141,7 @@ def create_service_account_config(service_account_file):
         "backup_enabled": True
     }
     
-    with open('gdrive_service_config.json', 'w') as f:
-        json.dump(config, f, indent=2)
+    write_json('gdrive_service_config.json', config)
     
     print("✅ Created gdrive_service_config.json")
 
@@ -103,6 +151,7 @@ def create_service_account_uploader():
 import json
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+from googleapiclient.http import MediaFileUpload
 
 class ServiceAccountGDriveUploader:
     """Google Drive uploader using service account authentication"""
@@ -153,7 +202,6 @@ class ServiceAccountGDriveUploader:
             if folder_id:
                 file_metadata['parents'] = [folder_id]
             
-            from googleapiclient.http import MediaFileUpload
             media = MediaFileUpload(file_path)
             
             file = self.service.files().create(
@@ -4,12 +4,14 @@ Google Drive Shared Drive Manager
 Helps create and manage shared drives for service accounts
 """
 import os
-import json
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 from datetime import datetime
 
+from gdrive_common import build_drive_service, cached_json
+from json_io import write_json
+
+# Drive scope requested by the service account
+DRIVE_SCOPES = ('https://www.googleapis.com/auth/drive',)
+
 class SharedDriveManager:
     """Manage Google Drive shared drives for service accounts"""
     
@@ -26,16 +28,10 @@ class SharedDriveManager:
         
         try:
             # Load service account email
-            with open(self.service_account_file, 'r') as f:
-                sa_data = json.load(f)
+            sa_data = cached_json(self.service_account_file)
             self.service_account_email = sa_data.get('client_email')
             
-            credentials = service_account.Credentials.from_service_account_file(
-                self.service_account_file,
-                scopes=['https://www.googleapis.com/auth/drive']
-            )
-            
-            self.service = build('drive', 'v3', credentials=credentials)
+            self.service = build_drive_service(self.service_account_file, DRIVE_SCOPES)
             print(f"✅ Authenticated as: {self.service_account_email}")
             return True
             
@@ -48,32 +44,46 @@ class SharedDriveManager:
         if not self.service and not self.authenticate():
             return []
         
+        from googleapiclient.errors import HttpError
+        
         try:
             print("📁 Scanning for shared drives...")
             drives_result = self.service.drives().list().execute()
             shared_drives = drives_result.get('drives', [])
             
             if shared_drives:
+                # Probe every drive's permissions in one batched HTTP request
+                probe_errors = {}
+                
+                def on_probe(request_id, response, exception):
+                    probe_errors[request_id] = exception
+                
+                batch = self.service.new_batch_http_request(callback=on_probe)
+                for drive in shared_drives:
+                    # Try to list files to test permissions
+                    batch.add(self.service.files().list(
+                        q=f"'{drive['id']}' in parents",
+                        pageSize=1,
+                        supportsAllDrives=True,
+                        includeItemsFromAllDrives=True
+                    ), request_id=drive['id'])
+                batch.execute()
+                
                 print(f"✅ Found {len(shared_drives)} shared drive(s):")
                 for i, drive in enumerate(shared_drives, 1):
                     print(f"   {i}. {drive['name']}")
                     print(f"      ID: {drive['id']}")
                     
                     # Check if we can write to it
-                    try:
-                        # Try to list files to test permissions
-                        self.service.files().list(
-                            q=f"'{drive['id']}' in parents",
-                            pageSize=1,
-                            supportsAllDrives=True,
-                            includeItemsFromAllDrives=True
-                        ).execute()
+                    e = probe_errors.get(drive['id'])
+                    if e is None:
                         print(f"      Access: ✅ Read/Write")
-                    except HttpError as e:
-                        if e.resp.status == 403:
-                            print(f"      Access: ❌ No permission")
-                        else:
-                            print(f"      Access: ⚠️  Unknown ({e.resp.status})")
+                    elif isinstance(e, HttpError) and e.resp.status == 403:
+                        print(f"      Access: ❌ No permission")
+                    elif isinstance(e, HttpError):
+                        print(f"      Access: ⚠️  Unknown ({e.resp.status})")
+                    else:
+                        print(f"      Access: ⚠️  Unknown ({e})")
                     print()
                 
                 return shared_drives
@@ -113,8 +123,7 @@ class SharedDriveManager:
         os.makedirs('data/config', exist_ok=True)
         config_file = 'data/config/gdrive_shared_drive_info.json'
         
-        with open(config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        write_json(config_file, config)
         
         print(f"✅ Created shared drive config: {config_file}")
         print(f"   Drive: {drive_name}")
@@ -127,12 +136,14 @@ class SharedDriveManager:
         if not self.service and not self.authenticate():
             return False
         
+        from googleapiclient.errors import HttpError
+        from googleapiclient.http import MediaInMemoryUpload
+        
         if not drive_id:
             # Try to load from config
             config_file = 'data/config/gdrive_shared_drive_info.json'
             if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
+                config = cached_json(config_file)
                 drive_id = config.get('shared_drive_id')
                 drive_name = config.get('shared_drive_name', 'Unknown')
             else:
@@ -140,29 +151,28 @@ class SharedDriveManager:
                 return False
         
         try:
+            # One clock read for the file name, content, and last_tested stamp
+            now = datetime.now()
+            timestamp = now.isoformat()
+            
             # Create a test file
-            test_filename = f"test_upload_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            test_filename = f"test_upload_{now.strftime('%Y%m%d_%H%M%S')}.txt"
             test_content = f"""Service Account Upload Test
-Timestamp: {datetime.now().isoformat()}
+Timestamp: {timestamp}
 Service Account: {self.service_account_email}
 Test successful!
 """
             
-            with open(test_filename, 'w') as f:
-                f.write(test_content)
-            
-            print(f"📄 Created test file: {test_filename}")
-            
-            # Upload to shared drive
-            from googleapiclient.http import MediaFileUpload
+            print(f"📄 Prepared test file: {test_filename}")
             
+            # Upload to shared drive straight from memory in a single request
             file_metadata = {
                 'name': test_filename,
                 'parents': [drive_id],
                 'description': 'Test upload from PlaylistCleaner service account'
             }
             
-            media = MediaFileUpload(test_filename, resumable=True)
+            media = MediaInMemoryUpload(test_content.encode('utf-8'), mimetype='text/plain', resumable=False)
             
             file = self.service.files().create(
                 body=file_metadata,
@@ -179,20 +189,11 @@ Test successful!
             # Update config with successful test
             config_file = 'data/config/gdrive_shared_drive_info.json'
             if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-                config['last_tested'] = datetime.now().isoformat()
+                config = dict(cached_json(config_file))
+                config['last_tested'] = timestamp
                 config['last_test_file_id'] = file.get('id')
                 
-                with open(config_file, 'w') as f:
-                    json.dump(config, f, indent=2)
-            
-            # Clean up local file
-            try:
-                os.remove(test_filename)
-                print(f"🧹 Cleaned up: {test_filename}")
-            except:
-                pass
+                write_json(config_file, config)
             
             return True
             
@@ -1,58 +1,78 @@
-import json
+import mmap
+import os
 import re
 
+from config_cache import get_buckets
+
+# One EXTINF line plus the line that follows it (the URL), if there is one
+ENTRY_PATTERN = re.compile(rb'^([ \t]*#EXTINF:[^\n]*(?:\n|\Z))([^\n]*\n|[^\n]+)?', re.MULTILINE)
+
+# Opening of the group-title attribute on EXTINF lines
+GROUP_TITLE_PREFIX = b'group-title="'
+
+# Buffer size for the output file (1 MiB)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Kept entries are joined and written in batches of this many
+WRITE_CHUNK_ENTRIES = 10000
+
+# Block size used when counting lines in the mapped playlist
+COUNT_CHUNK_SIZE = 1 << 20
+
 # Load exclude=false groups
 print("Loading groups...")
-with open('group_titles_with_flags.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
-
-allowed_groups = set()
-for entry in data:
-    if entry.get('exclude') == 'false':
-        allowed_groups.add(entry.get('group_title'))
+allowed_groups, _ = get_buckets('group_titles_with_flags.json')
 
 print(f"Found {len(allowed_groups)} allowed groups")
 
-# Read M3U file
-print("Reading M3U file...")
-with open('raw_playlist_20.m3u', 'r', encoding='utf-8') as f:
-    lines = f.readlines()
-
-print(f"M3U file has {len(lines)} lines")
+# Compare group titles as raw bytes so lines never need decoding
+allowed_group_bytes = {group.encode('utf-8') for group in allowed_groups if group is not None}
 
-# Filter entries
-filtered_lines = ['#EXTM3U\n']
+# Map the M3U file and copy kept entries straight out of the mapping
+print("Reading M3U file...")
 total_entries = 0
 included_entries = 0
+line_count = 0
+written_lines = 1
 
-i = 1  # Skip first line (#EXTM3U)
-while i < len(lines):
-    line = lines[i].strip()
+with open('raw_playlist_20.m3u', 'rb') as fin, \
+        open('filtered_playlist.m3u', 'wb', buffering=WRITE_BUFFER_SIZE) as fout:
+    parts = [b'#EXTM3U\n']
     
-    if line.startswith('#EXTINF:'):
-        total_entries += 1
-        
-        # Extract group-title
-        group_match = re.search(r'group-title="([^"]*)"', line)
-        
-        if group_match:
-            group_title = group_match.group(1)
+    size = os.fstat(fin.fileno()).st_size
+    if size:
+        with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            line_count = sum(mm[i:i + COUNT_CHUNK_SIZE].count(b'\n') for i in range(0, size, COUNT_CHUNK_SIZE))
+            if mm[size - 1:size] != b'\n':
+                line_count += 1  # Last line has no trailing newline
             
-            if group_title in allowed_groups:
-                # Include this entry
-                filtered_lines.append(lines[i])      # EXTINF line
-                if i + 1 < len(lines):
-                    filtered_lines.append(lines[i + 1])  # URL line
-                    included_entries += 1
-        
-        i += 2  # Skip both EXTINF and URL lines
-    else:
-        i += 1
-
-# Write filtered file
-print("Writing filtered file...")
-with open('filtered_playlist.m3u', 'w', encoding='utf-8') as f:
-    f.writelines(filtered_lines)
+            # Skip first line (#EXTM3U); each match takes an EXTINF line and its URL line
+            start = mm.find(b'\n') + 1 or size
+            for match in ENTRY_PATTERN.finditer(mm, start):
+                total_entries += 1
+                extinf_line, url_line = match.groups()
+                
+                # Extract group-title with plain byte searches
+                title_start = extinf_line.find(GROUP_TITLE_PREFIX)
+                if title_start < 0:
+                    continue
+                title_start += len(GROUP_TITLE_PREFIX)
+                title_end = extinf_line.find(b'"', title_start)
+                
+                if title_end >= 0 and extinf_line[title_start:title_end] in allowed_group_bytes:
+                    # Include this entry
+                    parts.append(match.group(0))
+                    written_lines += 1
+                    if url_line is not None:
+                        written_lines += 1
+                        included_entries += 1
+                    
+                    if len(parts) >= WRITE_CHUNK_ENTRIES:
+                        fout.write(b''.join(parts))
+                        parts.clear()
+    
+    fout.write(b''.join(parts))
 
+print(f"M3U file has {line_count} lines")
 print(f"Done! Processed {total_entries} entries, included {included_entries}")
-print(f"Created filtered_playlist.m3u with {len(filtered_lines)} lines")
+print(f"Created filtered_playlist.m3u with {written_lines} lines")
@@ -3,18 +3,25 @@
 Simple script to extract and count group titles from playlist
 """
 
+import mmap
+import os
 import re
 from collections import Counter
 
+from config_cache import get_buckets
+
+GROUP_TITLE_PATTERN = re.compile(rb'group-title="([^"]*)"')
+
 def extract_groups_from_playlist(playlist_file):
-    """Extract group titles from playlist file"""
+    """Extract group titles from playlist file, counted by their raw UTF-8 bytes"""
     try:
-        with open(playlist_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find all group-title values
-        group_matches = re.findall(r'group-title="([^"]*)"', content)
-        group_counts = Counter(group_matches)
+        # Count group-title values straight off the mapped bytes, no list of matches
+        with open(playlist_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    group_counts = Counter(m.group(1) for m in GROUP_TITLE_PATTERN.finditer(mm))
+            else:
+                group_counts = Counter()
         
         print(f"📁 File: {playlist_file}")
         print(f"📊 Found {len(group_counts)} unique groups with {sum(group_counts.values())} total entries")
@@ -22,7 +29,7 @@ def extract_groups_from_playlist(playlist_file):
         # Show top 20 groups by count
         print(f"\n🔝 Top 20 groups by channel count:")
         for group, count in group_counts.most_common(20):
-            print(f"   {count:4d} - '{group}'")
+            print(f"   {count:4d} - '{group.decode('utf-8')}'")
         
         return group_counts
     
@@ -33,13 +40,8 @@ def extract_groups_from_playlist(playlist_file):
 def load_config_groups():
     """Load groups from config file"""
     try:
-        import json
-        with open('group_titles_with_flags.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        config_groups = set()
-        for entry in data:
-            config_groups.add(entry.get('group_title'))
+        include, exclude = get_buckets('group_titles_with_flags.json')
+        config_groups = include | exclude
         
         print(f"📋 Config has {len(config_groups)} groups defined")
         return config_groups
@@ -59,9 +61,9 @@ if __name__ == "__main__":
     config_groups = load_config_groups()
     
     if playlist_groups and config_groups:
-        # Find unknown groups
-        playlist_group_names = set(playlist_groups.keys())
-        unknown_groups = playlist_group_names - config_groups
+        # Find unknown groups, comparing in bytes so playlist names are never decoded
+        config_group_bytes = frozenset(group.encode('utf-8') for group in config_groups if group is not None)
+        unknown_groups = playlist_groups.keys() - config_group_bytes
         
         print(f"\n⚠️  UNKNOWN GROUPS (not in config): {len(unknown_groups)}")
         if unknown_groups:
@@ -69,7 +71,7 @@ if __name__ == "__main__":
             unknown_counts.sort(key=lambda x: x[1], reverse=True)
             
             for group, count in unknown_counts:
-                print(f"   {count:4d} - '{group}'")
+                print(f"   {count:4d} - '{group.decode('utf-8')}'")
             
             total_unknown_channels = sum([count for _, count in unknown_counts])
             print(f"\n📊 Total channels in unknown groups: {total_unknown_channels}")
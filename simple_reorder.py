@@ -1,14 +1,18 @@
-import json
+from json_io import load_json, write_json
 
 # Read the JSON file
-with open("group_titles_with_flags.json", 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_json("group_titles_with_flags.json")
 
 print(f"Total entries: {len(data)}")
 
-# Separate by exclude value
-exclude_false = [entry for entry in data if entry.get("exclude") == "false"]
-exclude_true = [entry for entry in data if entry.get("exclude") == "true"]
+# Separate by exclude value in a single pass (other values are dropped)
+buckets = {"false": [], "true": []}
+for entry in data:
+    bucket = buckets.get(entry.get("exclude"))
+    if bucket is not None:
+        bucket.append(entry)
+exclude_false = buckets["false"]
+exclude_true = buckets["true"]
 
 print(f"Exclude false: {len(exclude_false)}")
 print(f"Exclude true: {len(exclude_true)}")
@@ -21,7 +25,6 @@ print(f"First entry exclude value: {reordered[0].get('exclude')}")
 print(f"Last entry exclude value: {reordered[-1].get('exclude')}")
 
 # Save the reordered data
-with open("group_titles_with_flags.json", 'w', encoding='utf-8') as f:
-    json.dump(reordered, f, indent=2, ensure_ascii=False)
+write_json("group_titles_with_flags.json", reordered)
 
 print("Done!")
@@ -3,25 +3,35 @@
 Sort group_titles_with_flags.json by exclude flag (false first) then by order
 """
 
-import json
+from operator import itemgetter
+
+from json_io import load_json, write_json
 
 def main():
     print("🔄 Sorting group_titles_with_flags.json by exclude flag and order...")
     
     # Load current config
     input_file = 'data/config/group_titles_with_flags.json'
-    with open(input_file, 'r', encoding='utf-8') as f:
-        config = json.load(f)
+    config = load_json(input_file)
     
     print(f"📊 Loaded {len(config)} groups")
     
-    # Sort by exclude flag (false first), then by order
+    # Partition by exclude flag in one pass, then sort each bucket by order
+    buckets = {}
+    for entry in config:
+        buckets.setdefault(entry['exclude'], []).append(entry)
+    by_order = itemgetter('order')
+    for bucket in buckets.values():
+        bucket.sort(key=by_order)
+    
     # exclude=false will come before exclude=true when sorted as strings
-    sorted_config = sorted(config, key=lambda x: (x['exclude'], x['order']))
+    sorted_config = [entry for flag in sorted(buckets) for entry in buckets[flag]]
+    included_groups = buckets.get('false', [])
+    excluded_groups = buckets.get('true', [])
     
     # Count groups by exclude flag
-    include_count = sum(1 for entry in sorted_config if entry['exclude'] == 'false')
-    exclude_count = sum(1 for entry in sorted_config if entry['exclude'] == 'true')
+    include_count = len(included_groups)
+    exclude_count = len(excluded_groups)
     
     print(f"📈 Groups breakdown:")
     print(f"  • Include (exclude=false): {include_count}")
@@ -30,13 +40,11 @@ def main():
     
     # Create backup
     backup_file = 'data/config/group_titles_with_flags_backup_before_sort.json'
-    with open(backup_file, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    write_json(backup_file, config)
     print(f"💾 Created backup: {backup_file}")
     
     # Write sorted config
-    with open(input_file, 'w', encoding='utf-8') as f:
-        json.dump(sorted_config, f, indent=2, ensure_ascii=False)
+    write_json(input_file, sorted_config)
     
     print(f"✅ Sorted configuration saved to: {input_file}")
     print(f"\n📋 File structure:")
@@ -45,12 +53,10 @@ def main():
     
     # Show first few of each type
     print(f"\n🔍 Preview - First 5 included groups:")
-    included_groups = [g for g in sorted_config if g['exclude'] == 'false']
     for i, group in enumerate(included_groups[:5]):
         print(f"  {i+1}. {group['group_title']} (order: {group['order']})")
     
     print(f"\n🔍 Preview - First 5 excluded groups:")
-    excluded_groups = [g for g in sorted_config if g['exclude'] == 'true']
     for i, group in enumerate(excluded_groups[:5]):
         print(f"  {i+1}. {group['group_title']} (order: {group['order']})")
 
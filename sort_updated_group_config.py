@@ -4,6 +4,7 @@ Sort group_titles_with_flags_updated.json by exclude flag (false first) then by
 """
 
 import json
+from operator import itemgetter
 
 def main():
     print("🔄 Sorting group_titles_with_flags_updated.json by exclude flag and order...")
@@ -15,9 +16,10 @@ def main():
     
     print(f"📊 Loaded {len(config)} groups")
     
-    # Sort by exclude flag (false first), then by order
+    # Sort by order, then stably by exclude flag (false first)
     # exclude=false will come before exclude=true when sorted as strings
-    sorted_config = sorted(config, key=lambda x: (x['exclude'], x['order']))
+    sorted_config = sorted(config, key=itemgetter('order'))
+    sorted_config.sort(key=itemgetter('exclude'))
     
     # Count groups by exclude flag
     include_count = sum(1 for entry in sorted_config if entry['exclude'] == 'false')
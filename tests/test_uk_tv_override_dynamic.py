@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Regression tests for uk_tv_override_dynamic.py playlist parsing
+Expected outputs were captured from the original read()/strip()/split() implementation
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uk_tv_override_dynamic import UKTVOverrideProcessor
+
+UK = "🇬🇧 TV Guide (UK)"
+
+class ProcessPlaylistTest(unittest.TestCase):
+    def run_overrides(self, playlist, config):
+        """Run process_playlist on the given playlist text, returning (output, stdout)"""
+        with tempfile.TemporaryDirectory() as tmp:
+            input_file = os.path.join(tmp, 'in.m3u')
+            output_file = os.path.join(tmp, 'out.m3u')
+            config_file = os.path.join(tmp, 'overrides.conf')
+            with open(input_file, 'w', encoding='utf-8', newline='') as f:
+                f.write(playlist)
+            with open(config_file, 'w', encoding='utf-8') as f:
+                f.write(config)
+
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                UKTVOverrideProcessor(config_file).process_playlist(input_file, output_file)
+
+            with open(output_file, 'r', encoding='utf-8', newline='') as f:
+                return f.read(), stdout.getvalue()
+
+    def test_dangling_extinf_before_trailing_blank_lines_is_not_indexed(self):
+        playlist = (
+            f'#EXTM3U\n#EXTINF:-1 group-title="{UK}",BBC 5\nu\n'
+            '#EXTINF:-1 group-title="Kids",Tail\n\n\n'
+        )
+        output, stdout = self.run_overrides(playlist, "BBC 5 = Tail\n")
+
+        self.assertEqual(output, f'#EXTM3U\n#EXTINF:-1 group-title="{UK}",BBC 5\nu\n#EXTINF:-1 group-title="Kids",Tail')
+        self.assertIn("Indexed 1 playlist entries", stdout)
+        self.assertIn("Warning: Replacement 'Tail' not found for BBC 5", stdout)
+        self.assertIn("Replacements made: 0", stdout)
+
+    def test_blank_lines_at_start_and_end_are_dropped(self):
+        playlist = (
+            f'\n\n  #EXTM3U\n#EXTINF:-1 group-title="{UK}",BBC 1\nu1\n\n'
+            '#EXTINF:-1 group-title="US| Movies",Chan 5 HD\nu5\n\n\n'
+        )
+        output, stdout = self.run_overrides(playlist, "BBC 1 = US| Movies||Chan 5 HD\n")
+
+        self.assertEqual(output, (
+            f'#EXTM3U\n#EXTINF:-1 group-title="{UK}",Chan 5 HD\nu5\n\n'
+            '#EXTINF:-1 group-title="US| Movies",Chan 5 HD\nu5'
+        ))
+        self.assertIn("Indexed 2 playlist entries", stdout)
+        self.assertIn("Replacements made: 1", stdout)
+
+    def test_interior_blank_line_is_taken_as_url(self):
+        playlist = '#EXTM3U\n#EXTINF:-1 group-title="Kids",A\n\n\n#EXTINF:-1 group-title="Kids",B\nub\n'
+        output, stdout = self.run_overrides(playlist, "BBC 1 = Kids||B\n")
+
+        self.assertEqual(output, '#EXTM3U\n#EXTINF:-1 group-title="Kids",A\n\n\n#EXTINF:-1 group-title="Kids",B\nub')
+        self.assertIn("Indexed 2 playlist entries", stdout)
+
+    def test_crlf_playlist_without_trailing_newline(self):
+        playlist = (
+            f'#EXTM3U\r\n#EXTINF:-1 group-title="{UK}",BBC 2\r\nu2\r\n'
+            '#EXTINF:-1 group-title="X",Chan 7 HD\r\nu7'
+        )
+        output, stdout = self.run_overrides(playlist, "BBC 2 = Chan 7 HD\n")
+
+        self.assertEqual(output, (
+            f'#EXTM3U\n#EXTINF:-1 group-title="{UK}",Chan 7 HD\nu7\n'
+            '#EXTINF:-1 group-title="X",Chan 7 HD\nu7'
+        ))
+        self.assertIn("Replacements made: 1", stdout)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,10 +4,17 @@ Automatic Google Drive Token Refresh System
 Keeps OAuth tokens fresh automatically
 """
 import os
+import sys
 import json
-import time
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+def parse_token_expiry(expiry):
+    """Parse a token expiry timestamp"""
+    # Python 3.11+ accepts the trailing 'Z' natively
+    if sys.version_info >= (3, 11):
+        return datetime.fromisoformat(expiry)
+    return datetime.fromisoformat(expiry.replace('Z', '+00:00'))
 
 class TokenRefreshManager:
     """Manages automatic token refresh for Google Drive"""
@@ -15,19 +22,28 @@ class TokenRefreshManager:
     def __init__(self, token_file="data/config/gdrive_token.json"):
         self.token_file = token_file
         self.refresh_interval = 30 * 60  # Refresh every 30 minutes
+        self.error_backoff = 60  # First wait after a loop error, doubled up to refresh_interval
         self.running = False
         self.refresh_thread = None
+        self._stop_event = threading.Event()  # Wakes the monitor loop as soon as monitoring stops
+        self._expiry_cache = None  # ((mtime_ns, size), expiry) of the last parsed token file
     
     def get_token_expiry(self):
-        """Get token expiry time"""
+        """Get token expiry time, re-reading the token file only when it has changed"""
         try:
+            st = os.stat(self.token_file)
+            key = (st.st_mtime_ns, st.st_size)
+            if self._expiry_cache and self._expiry_cache[0] == key:
+                return self._expiry_cache[1]
+            
             with open(self.token_file, 'r') as f:
                 token_data = json.load(f)
             
+            expiry_time = None
             if 'expiry' in token_data and token_data['expiry']:
-                expiry_time = datetime.fromisoformat(token_data['expiry'].replace('Z', '+00:00'))
-                return expiry_time
-            return None
+                expiry_time = parse_token_expiry(token_data['expiry'])
+            self._expiry_cache = (key, expiry_time)
+            return expiry_time
             
         except Exception as e:
             print(f"❌ Error reading token: {e}")
@@ -62,8 +78,12 @@ class TokenRefreshManager:
                 with open(self.token_file, 'w') as f:
                     f.write(creds.to_json())
                 
-                expiry = datetime.fromisoformat(creds.expiry.replace('Z', '+00:00'))
-                print(f"✅ Token refreshed! New expiry: {expiry}")
+                # Seed the expiry cache so the next check doesn't re-parse the file we just wrote
+                if creds.expiry:
+                    st = os.stat(self.token_file)
+                    self._expiry_cache = ((st.st_mtime_ns, st.st_size), creds.expiry.replace(tzinfo=timezone.utc))
+                
+                print(f"✅ Token refreshed! New expiry: {creds.expiry}")
                 return True
             else:
                 print("⚠️  Cannot refresh token - no refresh token available")
@@ -75,6 +95,7 @@ class TokenRefreshManager:
     
     def monitor_loop(self):
         """Background monitoring loop"""
+        backoff = self.error_backoff
         while self.running:
             try:
                 if self.needs_refresh():
@@ -86,12 +107,17 @@ class TokenRefreshManager:
                         time_left = expiry - now
                         print(f"✅ Token valid for: {time_left}")
                 
+                backoff = self.error_backoff
+                
                 # Wait before next check
-                time.sleep(self.refresh_interval)
+                if self._stop_event.wait(self.refresh_interval):
+                    break
                 
             except Exception as e:
-                print(f"❌ Monitor loop error: {e}")
-                time.sleep(60)  # Wait 1 minute on error
+                print(f"❌ Monitor loop error: {e} (retrying in {backoff}s)")
+                if self._stop_event.wait(backoff):
+                    break
+                backoff = min(backoff * 2, self.refresh_interval)
     
     def start_monitoring(self):
         """Start background token monitoring"""
@@ -100,6 +126,7 @@ class TokenRefreshManager:
             return
         
         self.running = True
+        self._stop_event.clear()
         self.refresh_thread = threading.Thread(target=self.monitor_loop, daemon=True)
         self.refresh_thread.start()
         print("🔄 Started automatic token refresh monitoring")
@@ -107,6 +134,7 @@ class TokenRefreshManager:
     def stop_monitoring(self):
         """Stop background token monitoring"""
         self.running = False
+        self._stop_event.set()
         if self.refresh_thread:
             self.refresh_thread.join(timeout=5)
         print("⏹️  Stopped token monitoring")
@@ -8,36 +8,69 @@ Uses group-title and channel name as identifiers for robust matching
 import re
 import sys
 import os
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
 
-# Fix Unicode encoding issues on Windows
+# Fix Unicode encoding issues on Windows by reconfiguring the existing streams in place
 if sys.platform.startswith('win'):
     try:
-        import codecs
-        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'replace')
-        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'replace')
-    except:
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+        sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+    except Exception:
         pass  # Fallback to default behavior
 
+# Every EXTINF attribute read by PlaylistEntry, matched in a single scan of the line
+ATTRIBUTE_PATTERN = re.compile(
+    r'(?:CUID="(?P<cuid>[^"]*)"'
+    r'|tvg-id="(?P<tvg_id>[^"]*)"'
+    r'|tvg-name="(?P<tvg_name>[^"]*)"'
+    r'|tvg-logo="(?P<tvg_logo>[^"]*)"'
+    r'|group-title="(?P<group_title>[^"]*)")'
+)
+
+# Matches the whole group-title attribute so it can be swapped out
+GROUP_TITLE_PATTERN = re.compile(r'group-title="[^"]*"')
+
+def trimmed_lines(m3u_lines: Iterable[str]) -> Iterator[str]:
+    """Yield stripped lines, dropping blank lines at the start and end of the playlist like content.strip()"""
+    pending_blanks = 0
+    seen_content = False
+    
+    for raw_line in m3u_lines:
+        line = raw_line.strip()
+        if not line:
+            # Only emitted once a non-blank line follows
+            if seen_content:
+                pending_blanks += 1
+            continue
+        
+        for _ in range(pending_blanks):
+            yield ''
+        pending_blanks = 0
+        seen_content = True
+        yield line
+
 class PlaylistEntry:
+    __slots__ = ('extinf_line', 'url_line', 'cuid', 'tvg_id', 'tvg_name', 'tvg_logo',
+                 'group_title', 'channel_name', 'group_channel_id')
+    
     def __init__(self, extinf_line, url_line):
         self.extinf_line = extinf_line
         self.url_line = url_line
-        self.cuid = self._extract_attribute('CUID')
-        self.tvg_id = self._extract_attribute('tvg-id')
-        self.tvg_name = self._extract_attribute('tvg-name')
-        self.tvg_logo = self._extract_attribute('tvg-logo')
-        self.group_title = self._extract_attribute('group-title')
+        
+        # First occurrence of each attribute wins
+        attributes = {}
+        for match in ATTRIBUTE_PATTERN.finditer(extinf_line):
+            attributes.setdefault(match.lastgroup, match.group(match.lastgroup))
+        
+        self.cuid = attributes.get('cuid')
+        self.tvg_id = attributes.get('tvg_id')
+        self.tvg_name = attributes.get('tvg_name')
+        self.tvg_logo = attributes.get('tvg_logo')
+        self.group_title = attributes.get('group_title')
         self.channel_name = self._extract_channel_name()
         
         # Create composite identifier using group-title and channel name
-        self.group_channel_id = f"{self.group_title}||{self.channel_name}" if self.group_title and self.channel_name else None
-    
-    def _extract_attribute(self, attr_name):
-        """Extract attribute value from EXTINF line"""
-        pattern = rf'{attr_name}="([^"]*)"'
-        match = re.search(pattern, self.extinf_line)
-        return match.group(1) if match else None
+        self.group_channel_id = (self.group_title, self.channel_name) if self.group_title and self.channel_name else None
     
     def _extract_channel_name(self):
         """Extract channel name (text after the last comma)"""
@@ -47,11 +80,13 @@ class PlaylistEntry:
 class UKTVOverrideProcessor:
     def __init__(self, config_file: str = "uk_tv_overrides_dynamic.conf"):
         self.config_file = config_file
-        self.overrides: Dict[str, str] = {}  # source_group_channel -> replacement_group_channel
+        self.overrides: Dict[Tuple[str, str], str] = {}  # (group_title, source_channel) -> replacement_group_channel
         self.uk_group_title = "🇬🇧 TV Guide (UK)"
-        self.playlist_entries: Dict[str, PlaylistEntry] = {}  # group_channel_id -> PlaylistEntry
+        self.playlist_entries: Dict[Tuple[str, str], PlaylistEntry] = {}  # group_channel_id -> PlaylistEntry
+        self.channel_name_entries: Dict[str, PlaylistEntry] = {}  # channel_name -> first indexed PlaylistEntry
+        self.uk_tv_entries: Dict[Tuple[str, str], PlaylistEntry] = {}  # group_channel_id -> UK TV Guide PlaylistEntry
         
-    def load_overrides(self) -> Dict[str, str]:
+    def load_overrides(self) -> Dict[Tuple[str, str], str]:
         """Load override configuration from file"""
         overrides = {}
         
@@ -76,7 +111,7 @@ class UKTVOverrideProcessor:
                         
                         if source_channel and replacement_spec:
                             # Create full group+channel identifier for source
-                            source_id = f"{self.uk_group_title}||{source_channel}"
+                            source_id = (self.uk_group_title, source_channel)
                             overrides[source_id] = replacement_spec
                             print(f"Loaded override: {source_channel} -> {replacement_spec}")
                         else:
@@ -89,42 +124,47 @@ class UKTVOverrideProcessor:
             
         return overrides
     
-    def build_playlist_index(self, m3u_content: str) -> None:
-        """Build index of all playlist entries by group_channel_id"""
-        lines = m3u_content.strip().split('\n')
-        i = 0
+    def build_playlist_index(self, m3u_lines: Iterable[str]) -> List[Union[PlaylistEntry, str]]:
+        """Build index of all playlist entries by group_channel_id, returning the parsed playlist in order"""
+        lines = trimmed_lines(m3u_lines)
+        items = []
         
-        while i < len(lines):
-            line = lines[i].strip()
-            
+        for line in lines:
             if line.startswith('#EXTINF:'):
                 # Get the next line as URL
-                if i + 1 < len(lines):
-                    url_line = lines[i + 1].strip()
+                url_line = next(lines, None)
+                if url_line is not None:
                     entry = PlaylistEntry(line, url_line)
+                    items.append(entry)
                     
                     if entry.group_channel_id:
+                        previous = self.playlist_entries.get(entry.group_channel_id)
                         self.playlist_entries[entry.group_channel_id] = entry
+                        if entry.group_title == self.uk_group_title:
+                            self.uk_tv_entries[entry.group_channel_id] = entry
                         
-                    i += 2  # Skip both EXTINF and URL lines
+                        # Point each channel name at the entry a scan of playlist_entries would find first
+                        if previous is None:
+                            self.channel_name_entries.setdefault(entry.channel_name, entry)
+                        elif self.channel_name_entries.get(entry.channel_name) is previous:
+                            self.channel_name_entries[entry.channel_name] = entry
                 else:
-                    i += 1
+                    # Malformed entry, kept as-is
+                    items.append(line)
             else:
-                i += 1
+                items.append(line)
+        
+        return items
     
     def find_replacement_entry(self, replacement_spec: str) -> PlaylistEntry:
         """Find replacement entry by group+channel specification"""
         # Parse replacement_spec: could be "group-title||channel-name" or just "channel-name"
         if '||' in replacement_spec:
             # Full specification with group-title
-            target_id = replacement_spec
+            target_id = tuple(replacement_spec.split('||', 1))
         else:
-            # Just channel name - search all groups for matching channel name
-            target_channel = replacement_spec
-            for group_channel_id, entry in self.playlist_entries.items():
-                if entry.channel_name == target_channel:
-                    return entry
-            return None
+            # Just channel name - first matching channel across all groups
+            return self.channel_name_entries.get(replacement_spec)
         
         return self.playlist_entries.get(target_id)
     
@@ -132,26 +172,26 @@ class UKTVOverrideProcessor:
         """List all UK TV Guide entries"""
         try:
             with open(m3u_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            self.build_playlist_index(content)
+                self.build_playlist_index(f)
             
             print(f"\nUK TV Guide entries found in {m3u_file}:")
             print("=" * 60)
             
-            uk_entries = [entry for group_id, entry in self.playlist_entries.items() 
-                         if entry.group_title == self.uk_group_title]
+            uk_entries = list(self.uk_tv_entries.values())
             
             if not uk_entries:
                 print("No UK TV Guide entries found.")
                 return
             
-            for entry in sorted(uk_entries, key=lambda x: x.channel_name):
-                print(f"Channel: {entry.channel_name}")
-                print(f"  TVG-ID: {entry.tvg_id}")
-                print(f"  TVG-Name: {entry.tvg_name}")
-                print(f"  Group: {entry.group_title}")
-                print()
+            # Format every entry first and write the listing in one go
+            blocks = [
+                f"Channel: {entry.channel_name}\n"
+                f"  TVG-ID: {entry.tvg_id}\n"
+                f"  TVG-Name: {entry.tvg_name}\n"
+                f"  Group: {entry.group_title}\n\n"
+                for entry in sorted(uk_entries, key=lambda x: x.channel_name)
+            ]
+            sys.stdout.write(''.join(blocks))
                 
         except Exception as e:
             print(f"Error reading playlist file: {e}")
@@ -160,32 +200,31 @@ class UKTVOverrideProcessor:
         """Find channels matching search term"""
         try:
             with open(m3u_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            self.build_playlist_index(content)
+                self.build_playlist_index(f)
             
             print(f"\nSearching for channels matching '{search_term}':")
             print("=" * 60)
             
-            matches = []
-            search_lower = search_term.lower()
-            
-            for entry in self.playlist_entries.values():
-                if (search_lower in entry.channel_name.lower() or 
-                    (entry.tvg_name and search_lower in entry.tvg_name.lower())):
-                    matches.append(entry)
+            # One case-insensitive pattern instead of lowercasing both names of every entry
+            search_pattern = re.compile(re.escape(search_term), re.IGNORECASE)
+            matches = [entry for entry in self.playlist_entries.values()
+                       if search_pattern.search(entry.channel_name) or
+                       (entry.tvg_name and search_pattern.search(entry.tvg_name))]
             
             if not matches:
                 print("No matching channels found.")
                 return
             
-            for entry in sorted(matches, key=lambda x: (x.group_title, x.channel_name)):
-                print(f"Channel: {entry.channel_name}")
-                print(f"  TVG-ID: {entry.tvg_id}")
-                print(f"  TVG-Name: {entry.tvg_name}")
-                print(f"  Group: {entry.group_title}")
-                print(f"  Identifier: {entry.group_title}||{entry.channel_name}")
-                print()
+            # Format every match first and write the results in one go
+            blocks = [
+                f"Channel: {entry.channel_name}\n"
+                f"  TVG-ID: {entry.tvg_id}\n"
+                f"  TVG-Name: {entry.tvg_name}\n"
+                f"  Group: {entry.group_title}\n"
+                f"  Identifier: {entry.group_title}||{entry.channel_name}\n\n"
+                for entry in sorted(matches, key=lambda x: (x.group_title, x.channel_name))
+            ]
+            sys.stdout.write(''.join(blocks))
                 
         except Exception as e:
             print(f"Error reading playlist file: {e}")
@@ -199,65 +238,44 @@ class UKTVOverrideProcessor:
             return
         
         try:
+            # Build index of all entries, keeping the parsed playlist for the pass below
             with open(input_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Build index of all entries
-            self.build_playlist_index(content)
+                items = self.build_playlist_index(f)
             print(f"Indexed {len(self.playlist_entries)} playlist entries")
             
-            # Process the playlist line by line
-            lines = content.strip().split('\n')
-            output_lines = []
+            # Process the parsed playlist entry by entry, writing output as we go
             replacements_made = 0
-            i = 0
             
-            while i < len(lines):
-                line = lines[i].strip()
+            with open(output_file, 'w', encoding='utf-8') as f:
+                separator = ''  # Lines are newline-separated, without a trailing newline
                 
-                if line.startswith('#EXTINF:'):
-                    # Check if this is a UK TV Guide entry to replace
-                    if i + 1 < len(lines):
-                        url_line = lines[i + 1].strip()
-                        entry = PlaylistEntry(line, url_line)
+                for entry in items:
+                    if isinstance(entry, str):
+                        # Not an EXTINF entry, keep as-is
+                        f.write(separator + entry)
+                        separator = '\n'
+                        continue
+                    
+                    extinf_line, url_line = entry.extinf_line, entry.url_line
+                    
+                    # Check if this entry should be replaced
+                    if entry.group_channel_id in self.overrides:
+                        replacement_spec = self.overrides[entry.group_channel_id]
+                        replacement_entry = self.find_replacement_entry(replacement_spec)
                         
-                        # Check if this entry should be replaced
-                        if entry.group_channel_id in self.overrides:
-                            replacement_spec = self.overrides[entry.group_channel_id]
-                            replacement_entry = self.find_replacement_entry(replacement_spec)
-                            
-                            if replacement_entry:
-                                # Create a modified EXTINF line that preserves the original group-title
-                                # but uses the replacement entry's other attributes
-                                modified_extinf = self._create_hybrid_extinf(entry, replacement_entry)
-                                
-                                output_lines.append(modified_extinf)
-                                output_lines.append(replacement_entry.url_line)
-                                replacements_made += 1
-                                print(f"Replaced: {entry.channel_name} -> {replacement_entry.channel_name} (preserved group-title)")
-                            else:
-                                # Replacement not found, keep original
-                                output_lines.append(line)
-                                output_lines.append(url_line)
-                                print(f"Warning: Replacement '{replacement_spec}' not found for {entry.channel_name}")
+                        if replacement_entry:
+                            # Create a modified EXTINF line that preserves the original group-title
+                            # but uses the replacement entry's other attributes
+                            extinf_line = self._create_hybrid_extinf(entry, replacement_entry)
+                            url_line = replacement_entry.url_line
+                            replacements_made += 1
+                            print(f"Replaced: {entry.channel_name} -> {replacement_entry.channel_name} (preserved group-title)")
                         else:
-                            # No replacement configured, keep original
-                            output_lines.append(line)
-                            output_lines.append(url_line)
-                        
-                        i += 2  # Skip both EXTINF and URL lines
-                    else:
-                        # Malformed entry, keep as-is
-                        output_lines.append(line)
-                        i += 1
-                else:
-                    # Not an EXTINF line, keep as-is
-                    output_lines.append(line)
-                    i += 1
-            
-            # Write output
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(output_lines))
+                            # Replacement not found, keep original
+                            print(f"Warning: Replacement '{replacement_spec}' not found for {entry.channel_name}")
+                    
+                    f.write(f"{separator}{extinf_line}\n{url_line}")
+                    separator = '\n'
             
             print(f"\nProcessing complete!")
             print(f"Replacements made: {replacements_made}")
@@ -274,19 +292,12 @@ class UKTVOverrideProcessor:
         # Replace the group-title with the original one
         if original_entry.group_title and replacement_entry.group_title:
             # Use regex to replace the group-title attribute
-            pattern = r'group-title="[^"]*"'
             replacement = f'group-title="{original_entry.group_title}"'
-            hybrid_line = re.sub(pattern, replacement, hybrid_line)
+            hybrid_line = GROUP_TITLE_PATTERN.sub(replacement, hybrid_line)
         
         return hybrid_line
 
 def main():
-    # Set up Windows Unicode output support
-    if sys.platform.startswith('win'):
-        import codecs
-        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
-        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
-    
     if len(sys.argv) < 2:
         print("Usage:")
         print(f"  {sys.argv[0]} --list <playlist.m3u>")
@@ -4,38 +4,38 @@ Update the exclude property for CA| prefixed group titles.
 Changes exclude from "false" to "true" for all group titles starting with "CA|".
 """
 
-import json
+from json_io import load_json, write_json
 
 
 def update_ca_exclude_flags(json_file_path):
     """Update exclude flags for CA| prefixed group titles."""
     try:
         # Read the current JSON file
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            group_data = json.load(file)
+        group_data = load_json(json_file_path)
         
         print(f"Loaded {len(group_data)} group titles from JSON file")
         
         # Track changes
         updated_count = 0
+        ca_groups = []
         
-        # Update CA| prefixed group titles
+        # Update CA| prefixed group titles, collecting them for the summary
         for entry in group_data:
-            if entry['group_title'].startswith('CA|'):
+            group_title = entry['group_title']
+            if group_title.startswith('CA|'):
+                ca_groups.append(entry)
                 if entry['exclude'] == "false":
                     entry['exclude'] = "true"
                     updated_count += 1
-                    print(f"Updated: {entry['group_title']}")
+                    print(f"Updated: {group_title}")
         
         # Write back to JSON file
-        with open(json_file_path, 'w', encoding='utf-8') as file:
-            json.dump(group_data, file, indent=2, ensure_ascii=False)
+        write_json(json_file_path, group_data)
         
         print(f"\nSuccessfully updated {updated_count} CA| group titles")
         print(f"Updated JSON file: {json_file_path}")
         
         # Show summary of CA| groups
-        ca_groups = [entry for entry in group_data if entry['group_title'].startswith('CA|')]
         print(f"\nTotal CA| groups: {len(ca_groups)}")
         print("CA| groups with exclude=true:")
         for entry in ca_groups:
@@ -3,57 +3,66 @@
 Update group_titles_with_flags.json with all categories found in the playlist
 """
 
-import json
 import re
 from collections import Counter
 
+from json_io import dump_json, load_json, write_atomic
+
+# Patterns that should typically be excluded
+EXCLUDE_KEYWORDS = (
+    # Adult content
+    ('adult', 'xxx', 'for adults'),
+    # Local networks/affiliates
+    ('network', 'affiliates', 'local'),
+    # TV guides
+    ('guide', 'tv guide'),
+    # Low quality
+    (' sd', 'sd '),
+    # HEVC (codec issues)
+    ('hevc', 'h265'),
+    # Specific sports leagues that are usually PPV/premium
+    ('league pass', 'center ice', 'extra innings', 'sunday ticket'),
+    # Game replays
+    ('replays', 'replay'),
+    # Some PPV patterns
+    ('ppv game', 'ppv event'),
+)
+
+# Patterns that should typically be included
+INCLUDE_KEYWORDS = (
+    # General content
+    ('entertainment', 'general', 'news', 'kids', 'music'),
+    # Sports (non-PPV)
+    ('sport', 'espn+', 'peacock', 'paramount+'),
+    # Premium services
+    ('hbo max', 'disney+', 'amazon prime', 'netflix', 'hulu'),
+    # High quality
+    ('4k', 'uhd', 'hd', 'raw'),
+    # International good content
+    ('uk|', 'ca|', 'au|', 'nz|'),
+)
+
+# Captures the group-title attribute value of each playlist entry
+GROUP_TITLE_PATTERN = re.compile(r'group-title="([^"]+)"')
+
+def keyword_pattern(keyword_groups):
+    """Compile keyword groups into one alternation so a group name is scanned once."""
+    return re.compile('|'.join(re.escape(keyword) for keywords in keyword_groups for keyword in keywords))
+
+EXCLUDE_PATTERN = keyword_pattern(EXCLUDE_KEYWORDS)
+INCLUDE_PATTERN = keyword_pattern(INCLUDE_KEYWORDS)
+
 def categorize_group(group_name):
     """Automatically categorize a group and suggest exclude flag based on patterns."""
     group_lower = group_name.lower()
     
-    # Patterns that should typically be excluded
-    exclude_patterns = [
-        # Adult content
-        ('adult', 'xxx', 'for adults'),
-        # Local networks/affiliates
-        ('network', 'affiliates', 'local'),
-        # TV guides
-        ('guide', 'tv guide'),
-        # Low quality
-        (' sd', 'sd '),
-        # HEVC (codec issues)
-        ('hevc', 'h265'),
-        # Specific sports leagues that are usually PPV/premium
-        ('league pass', 'center ice', 'extra innings', 'sunday ticket'),
-        # Game replays
-        ('replays', 'replay'),
-        # Some PPV patterns
-        ('ppv game', 'ppv event'),
-    ]
-    
     # Check for exclusion patterns
-    for patterns in exclude_patterns:
-        if any(pattern in group_lower for pattern in patterns):
-            return "true"
-    
-    # Patterns that should typically be included
-    include_patterns = [
-        # General content
-        ('entertainment', 'general', 'news', 'kids', 'music'),
-        # Sports (non-PPV)
-        ('sport', 'espn+', 'peacock', 'paramount+'),
-        # Premium services
-        ('hbo max', 'disney+', 'amazon prime', 'netflix', 'hulu'),
-        # High quality
-        ('4k', 'uhd', 'hd', 'raw'),
-        # International good content
-        ('uk|', 'ca|', 'au|', 'nz|'),
-    ]
+    if EXCLUDE_PATTERN.search(group_lower):
+        return "true"
     
     # Check for inclusion patterns
-    for patterns in include_patterns:
-        if any(pattern in group_lower for pattern in patterns):
-            return "false"
+    if INCLUDE_PATTERN.search(group_lower):
+        return "false"
     
     # Default to exclude for unknown patterns (conservative approach)
     return "false"  # Changed to false to be more inclusive by default
@@ -62,8 +71,7 @@ def main():
     print("🔄 Updating group_titles_with_flags.json with all categories...")
     
     # Load current config
-    with open('data/config/group_titles_with_flags.json', 'r', encoding='utf-8') as f:
-        current_config = json.load(f)
+    current_config = load_json('data/config/group_titles_with_flags.json')
     
     # Get the highest order number
     max_order = max(entry['order'] for entry in current_config)
@@ -73,8 +81,7 @@ def main():
     with open('data/downloaded_file.m3u', 'r', encoding='utf-8') as f:
         content = f.read()
     
-    groups = re.findall(r'group-title="([^"]+)"', content)
-    group_counts = Counter(groups)
+    group_counts = Counter(match.group(1) for match in GROUP_TITLE_PATTERN.finditer(content))
     
     print(f"📊 Found {len(group_counts)} unique groups in playlist")
     
@@ -96,10 +103,18 @@ def main():
     # Sort new groups by channel count (descending) for better organization
     new_groups.sort(key=lambda x: x[1], reverse=True)
     
+    # Serialize the backup now so the config can be extended in place
+    backup_json = dump_json(current_config)
+    
     # Add new groups to config
-    updated_config = current_config.copy()
+    updated_config = current_config
     current_order = max_order
     
+    # New entries are appended with orders above max_order, so only an unsorted config needs sorting
+    orders = [entry['order'] for entry in updated_config]
+    if any(earlier > later for earlier, later in zip(orders, orders[1:])):
+        updated_config.sort(key=lambda x: x['order'])
+    
     print("\n🔍 Auto-categorizing new groups...")
     added_count = 0
     
@@ -120,19 +135,14 @@ def main():
         status = "❌ EXCLUDE" if exclude_flag == "true" else "✅ INCLUDE"
         print(f"  {status}: '{group}' ({count} channels)")
     
-    # Sort by order to maintain consistency
-    updated_config.sort(key=lambda x: x['order'])
-    
     # Create backup of original
     backup_file = 'data/config/group_titles_with_flags_backup.json'
-    with open(backup_file, 'w', encoding='utf-8') as f:
-        json.dump(current_config, f, indent=2, ensure_ascii=False)
+    write_atomic(backup_file, backup_json)
     print(f"\n💾 Created backup: {backup_file}")
     
     # Write updated config
     output_file = 'data/config/group_titles_with_flags_updated.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(updated_config, f, indent=2, ensure_ascii=False)
+    write_atomic(output_file, dump_json(updated_config))
     
     print(f"\n✅ Updated configuration saved to: {output_file}")
     print(f"📊 Total groups: {len(updated_config)} ({added_count} new)")